@@ -16,7 +16,7 @@ v4 Changes:
   - 24-point NMC 622 OCV curve from literature
   - Figure 28/29/30 breakpoints for temp/SoC/SEV current limits
   - Double-step bug fixed: PackController.step() no longer drives pack physics
-  - HW safety independent of fault_latched (runs in try/except, always fires)
+  - HW safety independent of fault_latched (always fires)
   - All current limits clamped to max(0, ...)
   - OC discharge warning sign corrected per Table 13
   - OC fault only on charge at sub-zero per Table 13
@@ -49,11 +49,31 @@ from __future__ import annotations
 import csv
 import os
 from dataclasses import dataclass, field
-from enum import Enum, auto
+from enum import IntEnum, auto
 from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 
+# Optional Numba acceleration. The hot per-tick lookups are scalar, where
+# np.interp pays microseconds of dispatch for nanoseconds of arithmetic;
+# a compiled kernel removes that overhead. Without numba the same code
+# runs as plain Python -- slower, but identical results.
+try:
+    from numba import njit as _njit, prange as _prange
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+    _prange = range
+
+    def _njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when numba is not installed."""
+        if args and callable(args[0]):
+            return args[0]
+
+        def wrap(fn):
+            return fn
+        return wrap
+
 # =====================================================================
 # CONSTANTS -- straight from the horse's mouth (or the crow's beak)
 # Table 13: "Table of Alarm Threshold Values"
@@ -137,52 +157,125 @@ CURRENT_LIMIT_TOLERANCE = 0.01
 # Temperature/SoC variation from NMC pouch cell literature (RESEARCH.md)
 # =====================================================================
 
-_R_TEMPS = np.array([-10.0, 0.0, 10.0, 25.0, 35.0, 45.0])
-_R_SOCS = np.array([0.05, 0.20, 0.35, 0.50, 0.65, 0.80, 0.95])
+# Plain tuples of Python floats: _bilinear_interp runs on scalars every tick,
+# so per-call NumPy dispatch (np.clip / np.searchsorted on 0-d arrays) would
+# dominate the four multiplies of actual work.
+_R_TEMPS = (-10.0, 0.0, 10.0, 25.0, 35.0, 45.0)
+_R_SOCS = (0.05, 0.20, 0.35, 0.50, 0.65, 0.80, 0.95)
 # mΩ per module -- rows=SoC, cols=Temp
 # U-shaped impedance vs SoC: minimum at 50% (optimal intercalation gradient),
 # higher at extremes (depleted anode at low SoC, full cathode at high SoC).
 # Temperature multipliers preserved from NMC pouch cell literature.
-_R_TABLE = np.array([
-    [15.3,  9.7,  6.2,  5.0,  4.4,  4.1],  # SoC=5%  (high — depleted anode)
-    [10.9,  7.2,  4.7,  3.6,  3.3,  3.1],  # SoC=20%
-    [ 9.9,  6.6,  4.3,  3.3,  3.0,  2.8],  # SoC=35%
-    [ 9.3,  6.2,  4.0,  3.1,  2.8,  2.6],  # SoC=50% (minimum — optimal intercalation)
-    [ 9.6,  6.4,  4.2,  3.2,  2.9,  2.7],  # SoC=65%
-    [10.2,  6.8,  4.4,  3.4,  3.1,  2.9],  # SoC=80%
-    [13.5,  8.9,  5.6,  4.2,  3.9,  3.6],  # SoC=95% (high — full cathode)
-])
-
-
-def _bilinear_interp(temp: float, soc: float) -> float:
-    """Bilinear interpolation of module resistance (mΩ) from R(T, SoC) table."""
-    t = np.clip(temp, _R_TEMPS[0], _R_TEMPS[-1])
-    s = np.clip(soc, _R_SOCS[0], _R_SOCS[-1])
-
-    # Find bracketing indices for temperature
-    ti = np.searchsorted(_R_TEMPS, t, side='right') - 1
-    ti = np.clip(ti, 0, len(_R_TEMPS) - 2)
-    t_frac = (t - _R_TEMPS[ti]) / (_R_TEMPS[ti + 1] - _R_TEMPS[ti])
-
-    # Find bracketing indices for SoC
-    si = np.searchsorted(_R_SOCS, s, side='right') - 1
-    si = np.clip(si, 0, len(_R_SOCS) - 2)
-    s_frac = (s - _R_SOCS[si]) / (_R_SOCS[si + 1] - _R_SOCS[si])
-
-    # Bilinear
-    r00 = _R_TABLE[si, ti]
-    r01 = _R_TABLE[si, ti + 1]
-    r10 = _R_TABLE[si + 1, ti]
-    r11 = _R_TABLE[si + 1, ti + 1]
-
+_R_TABLE = (
+    (15.3,  9.7,  6.2,  5.0,  4.4,  4.1),  # SoC=5%  (high — depleted anode)
+    (10.9,  7.2,  4.7,  3.6,  3.3,  3.1),  # SoC=20%
+    ( 9.9,  6.6,  4.3,  3.3,  3.0,  2.8),  # SoC=35%
+    ( 9.3,  6.2,  4.0,  3.1,  2.8,  2.6),  # SoC=50% (minimum — optimal intercalation)
+    ( 9.6,  6.4,  4.2,  3.2,  2.9,  2.7),  # SoC=65%
+    (10.2,  6.8,  4.4,  3.4,  3.1,  2.9),  # SoC=80%
+    (13.5,  8.9,  5.6,  4.2,  3.9,  3.6),  # SoC=95% (high — full cathode)
+)
+
+
+def _gen_bilinear_src() -> str:
+    """Emit specialized _bilinear_interp source with the table baked in.
+
+    The 7x6 table shape and both breakpoint axes are fixed, so the
+    evaluator can be fully unrolled at import: every (si, ti) cell
+    becomes a branch leaf whose four corner values (pre-differenced for
+    the lerps) are immediate float constants -- zero loads from
+    _R_TABLE at run time. float repr() round-trips exactly, so the
+    generated function is bit-identical to the indexed table walk it
+    replaces.
+    """
+    lines = [
+        "def _bilinear_interp(temp, soc):",
+        '    """Bilinear module resistance (mΩ); generated, table baked in."""',
+        f"    t = max({_R_TEMPS[0]!r}, min({_R_TEMPS[-1]!r}, temp))",
+        f"    s = max({_R_SOCS[0]!r}, min({_R_SOCS[-1]!r}, soc))",
+        # Bracketing index for temperature: uniform (10 °C) below 25 °C,
+        # so direct arithmetic there; comparisons for the rest.
+        "    if t < 10.0:",
+        "        ti = int((t + 10.0) * 0.1)",
+        "    elif t < 25.0:",
+        "        ti = 2",
+        "    elif t < 35.0:",
+        "        ti = 3",
+        "    else:",
+        "        ti = 4",
+        # Bracketing index for SoC: uniform 0.15 spacing from 0.05
+        f"    si = min(5, int((s - {_R_SOCS[0]!r}) * {1.0 / 0.15!r}))",
+    ]
+    for si in range(6):
+        head = "if si == 0:" if si == 0 else (
+            "else:" if si == 5 else f"elif si == {si}:")
+        lines.append(f"    {head}")
+        lines.append(f"        s_frac = (s - {_R_SOCS[si]!r})"
+                     f" / {_R_SOCS[si + 1] - _R_SOCS[si]!r}")
+        for ti in range(5):
+            head = "if ti == 0:" if ti == 0 else (
+                "else:" if ti == 4 else f"elif ti == {ti}:")
+            r00 = _R_TABLE[si][ti]
+            r01 = _R_TABLE[si][ti + 1]
+            r10 = _R_TABLE[si + 1][ti]
+            r11 = _R_TABLE[si + 1][ti + 1]
+            lines.append(f"        {head}")
+            lines.append(f"            t_frac = (t - {_R_TEMPS[ti]!r})"
+                         f" / {_R_TEMPS[ti + 1] - _R_TEMPS[ti]!r}")
+            lines.append(f"            r0 = {r00!r} + {r01 - r00!r} * t_frac")
+            lines.append(f"            r1 = {r10!r} + {r11 - r10!r} * t_frac")
+    lines.append("    return r0 + (r1 - r0) * s_frac")
+    return "\n".join(lines) + "\n"
+
+
+exec(compile(_gen_bilinear_src(), '<corvus bilinear codegen>', 'exec'))
+# Generated source has no backing file for numba's cache locator, so
+# this one compiles fresh each run -- milliseconds for a function this
+# flat, and the AOT extension covers the hot path anyway.
+_bilinear_interp = _njit(_bilinear_interp)  # noqa: F821
+
+
+# NumPy views of the scalar lookup tables for the vectorized path.
+_R_TEMPS_ARR = np.array(_R_TEMPS)
+_R_SOCS_ARR = np.array(_R_SOCS)
+_R_TABLE_ARR = np.array(_R_TABLE)
+
+
+def _bilinear_interp_vec(temp: np.ndarray, soc: np.ndarray) -> np.ndarray:
+    """Vectorized counterpart of _bilinear_interp for array inputs (mΩ)."""
+    t = np.clip(temp, _R_TEMPS_ARR[0], _R_TEMPS_ARR[-1])
+    s = np.clip(soc, _R_SOCS_ARR[0], _R_SOCS_ARR[-1])
+    ti = np.clip(np.searchsorted(_R_TEMPS_ARR, t, side='right') - 1,
+                 0, len(_R_TEMPS) - 2)
+    si = np.clip(np.searchsorted(_R_SOCS_ARR, s, side='right') - 1,
+                 0, len(_R_SOCS) - 2)
+    t_frac = (t - _R_TEMPS_ARR[ti]) / (_R_TEMPS_ARR[ti + 1] - _R_TEMPS_ARR[ti])
+    s_frac = (s - _R_SOCS_ARR[si]) / (_R_SOCS_ARR[si + 1] - _R_SOCS_ARR[si])
+    r00 = _R_TABLE_ARR[si, ti]
+    r01 = _R_TABLE_ARR[si, ti + 1]
+    r10 = _R_TABLE_ARR[si + 1, ti]
+    r11 = _R_TABLE_ARR[si + 1, ti + 1]
     r0 = r00 + (r01 - r00) * t_frac
     r1 = r10 + (r11 - r10) * t_frac
-    return float(r0 + (r1 - r0) * s_frac)
+    return r0 + (r1 - r0) * s_frac
+
+
+# Dense precomputed resistance grid: T ∈ [-10, 45] °C at 0.1 °C, SoC ∈
+# [0, 1] at 0.001. Built once at import from the 7×6 table; each lookup is
+# then two clamps, two integer index computations, and one load. ~2.2 MB
+# as float32, which fits L2. Grid spacing matches the quantization already
+# accepted for memoization (< 0.1 mΩ error).
+_R_DENSE_T0 = -10.0
+_R_DENSE = _bilinear_interp_vec(
+    (_R_DENSE_T0 + 0.1 * np.arange(551))[:, None],
+    0.001 * np.arange(1001)[None, :]).astype(np.float32)
 
 
 def module_resistance(temp: float, soc: float) -> float:
-    """Module resistance in Ω (from mΩ table)."""
-    return _bilinear_interp(temp, soc) * 1e-3
+    """Module resistance in Ω (dense precomputed grid, nearest node)."""
+    ti = int((max(-10.0, min(45.0, temp)) - _R_DENSE_T0) * 10.0 + 0.5)
+    si = int(max(0.0, min(1.0, soc)) * 1000.0 + 0.5)
+    return float(_R_DENSE[ti, si]) * 1e-3
 
 
 def pack_resistance(temp: float, soc: float) -> float:
@@ -195,23 +288,39 @@ def pack_resistance(temp: float, soc: float) -> float:
 # Section 2.3: "SoC is a percentage measure of the charge remaining"
 # =====================================================================
 
-_SOC_BP = np.array([
+# Tuples are the scalar-path source of truth; the NumPy views below feed
+# the compiled kernel and the vectorized batch path.
+_SOC_BP_TUP = (
     0.00, 0.02, 0.05, 0.08, 0.10, 0.15, 0.20, 0.25,
     0.30, 0.35, 0.40, 0.45, 0.50, 0.55, 0.60, 0.65,
     0.70, 0.75, 0.80, 0.85, 0.90, 0.95, 0.98, 1.00,
-])
-_OCV_BP = np.array([
+)
+_OCV_BP_TUP = (
     3.000, 3.280, 3.420, 3.480, 3.510, 3.555, 3.590, 3.610,
     3.625, 3.638, 3.650, 3.662, 3.675, 3.690, 3.710, 3.735,
     3.765, 3.800, 3.845, 3.900, 3.960, 4.030, 4.100, 4.190,
-])
+)
+_SOC_BP = np.array(_SOC_BP_TUP)
+_OCV_BP = np.array(_OCV_BP_TUP)
 
 
 def ocv_from_soc(soc: float) -> float:
-    """Open-circuit voltage per cell from SoC."""
-    return float(np.interp(np.clip(soc, 0.0, 1.0), _SOC_BP, _OCV_BP))
+    """Open-circuit voltage per cell from SoC.
 
+    Specialized scalar lookup: the mostly-0.05-step layout of _SOC_BP
+    makes int(soc * 20) a bracket hint that a ≤3-step linear scan
+    finishes, so this entry point pays no NumPy or JIT dispatch. (The
+    physics kernel interpolates the same table internally via _interp1.)
+    """
+    s = max(0.0, min(1.0, soc))
+    i = min(22, int(s * 20.0))
+    while _SOC_BP_TUP[i + 1] < s:
+        i += 1
+    f = (s - _SOC_BP_TUP[i]) / (_SOC_BP_TUP[i + 1] - _SOC_BP_TUP[i])
+    return _OCV_BP_TUP[i] + f * (_OCV_BP_TUP[i + 1] - _OCV_BP_TUP[i])
 
+
+@_njit(cache=True)
 def _docv_dt(soc: float) -> float:
     """Piecewise dOCV/dT for NMC 622 (V/K).
 
@@ -240,16 +349,27 @@ def _docv_dt(soc: float) -> float:
         return  0.15e-3
 
 
+# Segment boundaries/values of the piecewise _docv_dt curve (V/K).
+_DOCV_SEG_BP = np.array([0.10, 0.25, 0.50, 0.70, 0.85, 0.95])
+_DOCV_SEG_V = np.array([-0.10e-3, -0.25e-3, -0.45e-3, -0.35e-3,
+                        -0.15e-3, 0.05e-3, 0.15e-3])
+
+
+def _docv_dt_vec(soc: np.ndarray) -> np.ndarray:
+    """Vectorized counterpart of _docv_dt (V/K)."""
+    return _DOCV_SEG_V[np.searchsorted(_DOCV_SEG_BP, soc, side='right')]
+
+
 # =====================================================================
 # CURRENT LIMIT CURVES -- Figures 28, 29, 30 (RESEARCH.md breakpoints)
 # All return C-rates as positive magnitudes. Caller multiplies by capacity.
 # =====================================================================
 
 # Figure 28: Temperature-based current limit
-_TEMP_CHARGE_BP = np.array([-25, 0, 5, 15, 35, 45, 55, 65])
+_TEMP_CHARGE_BP = np.array([-25.0, 0, 5, 15, 35, 45, 55, 65])
 _TEMP_CHARGE_CR = np.array([0.0, 0.0, 0.0, 3.0, 3.0, 2.0, 0.0, 0.0])
 
-_TEMP_DISCH_BP = np.array([-25, -15, -10, -5, 0, 5, 10, 25, 30, 35, 45, 55, 60, 65, 70])
+_TEMP_DISCH_BP = np.array([-25.0, -15, -10, -5, 0, 5, 10, 25, 30, 35, 45, 55, 60, 65, 70])
 _TEMP_DISCH_CR = np.array([0.2, 0.2, 1.0, 1.5, 2.0, 4.5, 5.0, 5.0, 4.5, 4.0, 3.8, 3.8, 0.2, 0.2, 0.0])
 # Fix #11: continuity -- added 70°C→0.0 so there's a linear ramp from 65→70°C
 
@@ -268,33 +388,134 @@ _SEV_DISCH_BP = np.array([3.000, 3.200, 3.300, 3.400, 3.450, 3.550, 4.200])
 _SEV_DISCH_CR = np.array([0.0, 0.0, 2.0, 2.5, 3.8, 5.0, 5.0])
 
 
+@_njit(cache=True)
+def _interp1(x: float, xp: np.ndarray, fp: np.ndarray) -> float:
+    """Scalar linear interpolation over a small sorted breakpoint array.
+
+    Equivalent to np.interp(x, xp, fp) for scalar x, without the per-call
+    NumPy dispatch. Binary search is at most 4 probes for the ≤24-entry
+    curves used here.
+    """
+    n = xp.shape[0]
+    if x <= xp[0]:
+        return fp[0]
+    if x >= xp[n - 1]:
+        return fp[n - 1]
+    lo = 0
+    hi = n - 1
+    while hi - lo > 1:
+        mid = (lo + hi) >> 1
+        if xp[mid] <= x:
+            lo = mid
+        else:
+            hi = mid
+    f = (x - xp[lo]) / (xp[lo + 1] - xp[lo])
+    return fp[lo] + f * (fp[lo + 1] - fp[lo])
+
+
+# Dense C-rate grids for the three limit curves, one entry per 0.01 °C /
+# 0.0001 SoC / 0.1 mV. Limits scale linearly with capacity, so the grids
+# hold C-rates and callers multiply by cap; temperature and SoC move far
+# less than one grid step per tick, and the curves are re-read every
+# controller step, so an O(1) indexed load replaces the interpolation.
+# Worst-case quantization is half a grid step on the steepest segment
+# (< 0.6 A at 128 Ah), below any modeled accuracy.
+_TEMP_CL_T0 = -25.0
+_TEMP_CL_GRID = _TEMP_CL_T0 + 0.01 * np.arange(9501)   # -25..70 °C
+_TEMP_CL_CHG = np.interp(_TEMP_CL_GRID, _TEMP_CHARGE_BP, _TEMP_CHARGE_CR)
+_TEMP_CL_DIS = np.interp(_TEMP_CL_GRID, _TEMP_DISCH_BP, _TEMP_DISCH_CR)
+
+_SOC_CL_GRID = 0.0001 * np.arange(10001)               # 0..1
+_SOC_CL_CHG = np.interp(_SOC_CL_GRID, _SOC_CHARGE_BP, _SOC_CHARGE_CR)
+_SOC_CL_DIS = np.interp(_SOC_CL_GRID, _SOC_DISCH_BP, _SOC_DISCH_CR)
+
+_SEV_CL_V0 = 3.000
+_SEV_CL_GRID = _SEV_CL_V0 + 0.0001 * np.arange(12001)  # 3.0..4.2 V
+_SEV_CL_CHG = np.interp(_SEV_CL_GRID, _SEV_CHARGE_BP, _SEV_CHARGE_CR)
+_SEV_CL_DIS = np.interp(_SEV_CL_GRID, _SEV_DISCH_BP, _SEV_DISCH_CR)
+
+
 def _temp_current_limit(temp: float, cap: float) -> Tuple[float, float]:
     """Figure 28: Temperature-based current limit. Returns (charge_A, discharge_A)."""
-    cc = float(np.interp(temp, _TEMP_CHARGE_BP, _TEMP_CHARGE_CR))
-    dc = float(np.interp(temp, _TEMP_DISCH_BP, _TEMP_DISCH_CR))
-    return max(0.0, cc * cap), max(0.0, dc * cap)
+    k = int((max(-25.0, min(70.0, temp)) - _TEMP_CL_T0) * 100.0 + 0.5)
+    return max(0.0, float(_TEMP_CL_CHG[k]) * cap), max(0.0, float(_TEMP_CL_DIS[k]) * cap)
 
 
 def _soc_current_limit(soc: float, cap: float) -> Tuple[float, float]:
     """Figure 29: SoC-based current limit. Returns (charge_A, discharge_A)."""
-    cc = float(np.interp(soc, _SOC_CHARGE_BP, _SOC_CHARGE_CR))
-    dc = float(np.interp(soc, _SOC_DISCH_BP, _SOC_DISCH_CR))
-    return max(0.0, cc * cap), max(0.0, dc * cap)
+    k = int(max(0.0, min(1.0, soc)) * 10000.0 + 0.5)
+    return max(0.0, float(_SOC_CL_CHG[k]) * cap), max(0.0, float(_SOC_CL_DIS[k]) * cap)
 
 
 def _sev_current_limit(cell_v: float, cap: float) -> Tuple[float, float]:
     """Figure 30: SEV (cell voltage) based current limit. Returns (charge_A, discharge_A)."""
-    cc = float(np.interp(cell_v, _SEV_CHARGE_BP, _SEV_CHARGE_CR))
-    dc = float(np.interp(cell_v, _SEV_DISCH_BP, _SEV_DISCH_CR))
-    return max(0.0, cc * cap), max(0.0, dc * cap)
+    k = int((max(3.0, min(4.2, cell_v)) - _SEV_CL_V0) * 10000.0 + 0.5)
+    return max(0.0, float(_SEV_CL_CHG[k]) * cap), max(0.0, float(_SEV_CL_DIS[k]) * cap)
+
+
+# =====================================================================
+# FUSED PACK PHYSICS KERNEL
+# =====================================================================
+
+@_njit(cache=True)
+def _pack_physics_step(soc: float, temp: float, current: float,
+                       contactors_closed: bool, dt: float, ext_heat: float,
+                       capacity_ah: float, n_cells: int,
+                       num_modules: int) -> Tuple[float, float, float, float, float, float]:
+    """Fused single sub-step of pack physics.
+
+    Coulomb counting, first-order thermal update, and terminal-voltage
+    update in one compiled kernel, sharing the OCV and resistance lookups
+    instead of re-dispatching through the interpreter between them.
+    Returns (soc, temperature, current, cell_voltage, pack_voltage,
+    r_pack) so the caller can cache the pack resistance it already
+    computed.
+    """
+    if not contactors_closed:
+        current = 0.0
+
+    # Coulomb counting -- Section 2.3
+    if current > 0:  # charging
+        effective_current = current * COULOMBIC_EFFICIENCY
+    else:  # discharging — full coulombic extraction
+        effective_current = current
+    soc = soc + (effective_current * dt) / (capacity_ah * 3600.0)
+    soc = max(0.0, min(1.0, soc))
+
+    # First-order thermal: dT/dt = (I²R + Q_rev + external - cooling) / C_thermal
+    r_pack = _bilinear_interp(temp, soc) * 1e-3 * num_modules
+    t_kelvin = temp + 273.15
+    q_rev = current * t_kelvin * _docv_dt(soc) * n_cells
+    heat_gen = current ** 2 * r_pack + q_rev + ext_heat
+    cooling = THERMAL_COOLING_COEFF * (temp - AMBIENT_TEMP)
+    temp += (heat_gen - cooling) / THERMAL_MASS * dt
+    temp = max(MIN_TEMPERATURE, min(MAX_TEMPERATURE, temp))
+
+    # Terminal voltage per cell = OCV + I * R_pack / N_cells
+    ocv = _interp1(soc, _SOC_BP, _OCV_BP)
+    r_pack = _bilinear_interp(temp, soc) * 1e-3 * num_modules
+    cell_v = ocv + current * r_pack / n_cells
+    pack_v = cell_v * n_cells
+    return soc, temp, current, cell_v, pack_v, r_pack
+
+
+# njit-callable handle for other compiled kernels. The AOT extension
+# (when present) rebinds _pack_physics_step to a plain C function below,
+# which nopython code cannot call, so compiled callers use this alias.
+_pack_physics_step_jit = _pack_physics_step
 
 
 # =====================================================================
 # ENUMS -- Section 7.1, Table 15: "Pack Operation Modes"
 # =====================================================================
 
-class PackMode(Enum):
-    """Table 15: Pack Operation Modes."""
+class PackMode(IntEnum):
+    """Table 15: Pack Operation Modes.
+
+    IntEnum so mode compares take CPython's fast int path and the
+    values pass into compiled kernels as plain int64; .name is still
+    there for logging and the CSV.
+    """
     OFF = auto()         # 7.1.7
     POWER_SAVE = auto()  # 7.1.2
     FAULT = auto()       # 7.1.3
@@ -312,7 +533,7 @@ class PackMode(Enum):
 _pack_id_registry: set = set()
 
 
-@dataclass
+@dataclass(slots=True)
 class VirtualPack:
     """
     Equivalent-circuit battery: OCV(SoC) + R(SoC, T).
@@ -328,6 +549,23 @@ class VirtualPack:
     current: float = 0.0
     cell_voltage: float = 0.0
     pack_voltage: float = 0.0
+    # Pack total internal resistance (Ω), refreshed by every state update
+    # rather than recomputed on each read -- the Kirchhoff solver reads it
+    # several times per tick.
+    r_total: float = field(init=False, default=0.0)
+    # Cached inverse of r_total (S). The Kirchhoff solver needs the
+    # conductance of every pack each solve; dividing once per state
+    # update here beats N high-latency divides per solver iteration.
+    g_total: float = field(init=False, default=0.0)
+    # Series cell count; fixed at construction, precomputed instead of
+    # re-multiplied on every voltage update
+    num_cells_series: int = field(init=False, default=0)
+    # Memoized cell OCV keyed on the SoC it was computed at: the solver
+    # reads ocv_pack several times between SoC changes, and the curve
+    # lookup is pure. Sentinel SoC is out of range so the first read
+    # always computes.
+    _ocv_cache: float = field(init=False, default=0.0)
+    _ocv_soc: float = field(init=False, default=-1.0)
 
     def __post_init__(self):
         # Enforce unique pack_id
@@ -344,24 +582,24 @@ class VirtualPack:
             raise ValueError(f"cells_per_module must be > 0, got {self.cells_per_module}")
         if self.capacity_ah <= 0:
             raise ValueError(f"capacity_ah must be > 0, got {self.capacity_ah}")
-        self.soc = float(np.clip(self.soc, 0.0, 1.0))
+        self.soc = min(1.0, max(0.0, float(self.soc)))
+        self.num_cells_series = self.num_modules * self.cells_per_module
         self._update_voltage()
 
-    @property
-    def num_cells_series(self) -> int:
-        return self.num_modules * self.cells_per_module
-
-    @property
-    def r_total(self) -> float:
-        """Pack total internal resistance from 2D lookup."""
-        return pack_resistance(self.temperature, self.soc)
+    def _ocv_cell(self) -> float:
+        if self.soc != self._ocv_soc:
+            self._ocv_cache = ocv_from_soc(self.soc)
+            self._ocv_soc = self.soc
+        return self._ocv_cache
 
     @property
     def ocv_pack(self) -> float:
-        return ocv_from_soc(self.soc) * self.num_cells_series
+        return self._ocv_cell() * self.num_cells_series
 
     def _update_voltage(self):
-        ocv = ocv_from_soc(self.soc)
+        ocv = self._ocv_cell()
+        self.r_total = pack_resistance(self.temperature, self.soc)
+        self.g_total = 1.0 / self.r_total
         # Terminal voltage per cell = OCV + I * R_pack / N_cells
         self.cell_voltage = ocv + self.current * self.r_total / self.num_cells_series
         self.pack_voltage = self.cell_voltage * self.num_cells_series
@@ -369,29 +607,12 @@ class VirtualPack:
     def _step_internal(self, dt: float, current: float, contactors_closed: bool,
                        external_heat: float = 0.0):
         """Single sub-step of pack physics (no dt subdivision)."""
-        if not contactors_closed:
-            self.current = 0.0
-        else:
-            self.current = current
-
-        # Coulomb counting -- Section 2.3
-        if self.current > 0:  # charging
-            effective_current = self.current * COULOMBIC_EFFICIENCY
-        else:  # discharging — full coulombic extraction
-            effective_current = self.current
-        delta_soc = (effective_current * dt) / (self.capacity_ah * 3600.0)
-        self.soc = np.clip(self.soc + delta_soc, 0.0, 1.0)
-
-        # First-order thermal: dT/dt = (I²R + Q_rev + external - cooling) / C_thermal
-        n_cells = self.num_cells_series
-        t_kelvin = self.temperature + 273.15
-        q_rev = self.current * t_kelvin * _docv_dt(self.soc) * n_cells
-        heat_gen = self.current ** 2 * self.r_total + q_rev + external_heat
-        cooling = THERMAL_COOLING_COEFF * (self.temperature - AMBIENT_TEMP)
-        self.temperature += (heat_gen - cooling) / THERMAL_MASS * dt
-        self.temperature = max(MIN_TEMPERATURE, min(MAX_TEMPERATURE, self.temperature))
-
-        self._update_voltage()
+        (self.soc, self.temperature, self.current,
+         self.cell_voltage, self.pack_voltage, self.r_total) = _pack_physics_step(
+            self.soc, self.temperature, current, contactors_closed, dt,
+            external_heat, self.capacity_ah, self.num_cells_series,
+            self.num_modules)
+        self.g_total = 1.0 / self.r_total
 
     def step(self, dt: float, current: float, contactors_closed: bool,
              external_heat: float = 0.0):
@@ -407,10 +628,349 @@ class VirtualPack:
 
 
 # =====================================================================
-# PACK CONTROLLER -- the real 7-mode state machine
+# BATCHED PACK STATE -- Struct-of-Arrays layout for many packs
 # =====================================================================
 
 @dataclass
+class PackArrayState:
+    """
+    Struct-of-Arrays state for stepping many packs in one shot.
+
+    One ndarray per field across all packs, so a whole-array physics step
+    is a fixed number of vectorized NumPy calls instead of N scalar
+    dispatches. VirtualPack remains the per-object reference model for
+    the interactive demo; this layout targets large arrays and parameter
+    sweeps. Use from_packs()/writeback() to sync with VirtualPack objects.
+
+    Fields other than soc are float32: real BMS telemetry is ~12-bit ADC
+    data, so single precision is far inside measurement noise and halves
+    the cache footprint of the batch arrays. SoC stays float64 because
+    coulomb counting accumulates tiny per-tick deltas that float32 would
+    round away over multi-hour runs.
+    """
+    soc: np.ndarray
+    temperature: np.ndarray
+    current: np.ndarray
+    cell_voltage: np.ndarray
+    pack_voltage: np.ndarray
+    capacity_ah: np.ndarray
+    num_modules: np.ndarray
+    num_cells: np.ndarray
+
+    @classmethod
+    def from_packs(cls, packs: List[VirtualPack]) -> "PackArrayState":
+        return cls(
+            soc=np.array([p.soc for p in packs]),
+            temperature=np.array([p.temperature for p in packs], dtype=np.float32),
+            current=np.array([p.current for p in packs], dtype=np.float32),
+            cell_voltage=np.array([p.cell_voltage for p in packs], dtype=np.float32),
+            pack_voltage=np.array([p.pack_voltage for p in packs], dtype=np.float32),
+            capacity_ah=np.array([p.capacity_ah for p in packs], dtype=np.float32),
+            num_modules=np.array([p.num_modules for p in packs], dtype=np.float32),
+            num_cells=np.array([p.num_cells_series for p in packs], dtype=np.float32),
+        )
+
+    def writeback(self, packs: List[VirtualPack]):
+        """Copy batched state back into the VirtualPack facade objects."""
+        for i, p in enumerate(packs):
+            p.soc = float(self.soc[i])
+            p.temperature = float(self.temperature[i])
+            p.current = float(self.current[i])
+            p.cell_voltage = float(self.cell_voltage[i])
+            p.pack_voltage = float(self.pack_voltage[i])
+            # Refresh the r_total/g_total caches at the new operating
+            # point, as _step_packs_batch does -- a later Kirchhoff
+            # solve reads them through _refresh_soa and must not see
+            # pre-batch values
+            p.r_total = pack_resistance(p.temperature, p.soc)
+            p.g_total = 1.0 / p.r_total
+
+    def _step_all_internal(self, dt: float, currents: np.ndarray,
+                           closed_mask: np.ndarray, ext_heat):
+        """Vectorized single sub-step -- mirrors _pack_physics_step."""
+        i = np.where(closed_mask, currents, 0.0).astype(np.float32)
+
+        # Coulomb counting -- Section 2.3 (float64: tiny per-tick deltas)
+        eff = np.where(i > 0, i * np.float64(COULOMBIC_EFFICIENCY), i)
+        soc = np.clip(self.soc + eff * dt / (self.capacity_ah.astype(np.float64) * 3600.0),
+                      0.0, 1.0)
+
+        # First-order thermal
+        r_pack = _bilinear_interp_vec(self.temperature, soc) * 1e-3 * self.num_modules
+        q_rev = i * (self.temperature + 273.15) * _docv_dt_vec(soc) * self.num_cells
+        heat_gen = i ** 2 * r_pack + q_rev + ext_heat
+        cooling = THERMAL_COOLING_COEFF * (self.temperature - AMBIENT_TEMP)
+        temp = self.temperature + (heat_gen - cooling) / THERMAL_MASS * dt
+        temp = np.clip(temp, MIN_TEMPERATURE, MAX_TEMPERATURE)
+
+        # Terminal voltage
+        ocv = np.interp(soc, _SOC_BP, _OCV_BP)
+        r_pack = _bilinear_interp_vec(temp, soc) * 1e-3 * self.num_modules
+        cell_v = ocv + i * r_pack / self.num_cells
+
+        self.soc = soc
+        # In-place writes keep the float32 storage dtype
+        self.temperature[:] = temp
+        self.current[:] = i
+        self.cell_voltage[:] = cell_v
+        self.pack_voltage[:] = cell_v * self.num_cells
+
+    def step_all(self, dt: float, currents: np.ndarray,
+                 closed_mask: np.ndarray, external_heat=0.0):
+        """Advance all packs by dt seconds (with large-dt subdivision)."""
+        if dt <= 0.0:
+            raise ValueError(f"dt must be > 0, got {dt}")
+        remaining = dt
+        while remaining > 0.0:
+            sub_dt = min(remaining, MAX_DT)
+            self._step_all_internal(sub_dt, currents, closed_mask, external_heat)
+            remaining -= sub_dt
+
+
+# =====================================================================
+# MONTE-CARLO BATCH DRIVER -- parallel independent trajectories
+# =====================================================================
+
+@_njit(cache=True, parallel=True)
+def simulate_batch(n_steps: int, dt: float,
+                   soc0: np.ndarray, temp0: np.ndarray,
+                   currents: np.ndarray, ext_heat: np.ndarray,
+                   capacity_ah: np.ndarray, n_cells: np.ndarray,
+                   num_modules: np.ndarray):
+    """Run many independent pack trajectories over compiled threads.
+
+    Each row r of the input arrays is one Monte-Carlo run: a pack
+    starting at (soc0[r], temp0[r]) stepped n_steps times at constant
+    current currents[r]. Runs share no state, so the outer loop is a
+    prange with no locks; each thread spins the scalar physics kernel
+    over its own rows. dt is subdivided to MAX_DT sub-steps exactly as
+    VirtualPack.step does. Returns (soc, temperature, cell_voltage,
+    pack_voltage) final-state arrays, float64, one entry per run.
+    """
+    n_runs = soc0.shape[0]
+    soc_out = np.empty(n_runs)
+    temp_out = np.empty(n_runs)
+    cell_v_out = np.empty(n_runs)
+    pack_v_out = np.empty(n_runs)
+    for r in _prange(n_runs):
+        soc = soc0[r]
+        temp = temp0[r]
+        cur = currents[r]
+        cell_v = 0.0
+        pack_v = 0.0
+        for _ in range(n_steps):
+            remaining = dt
+            while remaining > 0.0:
+                sub_dt = min(remaining, MAX_DT)
+                soc, temp, _i, cell_v, pack_v, _r = _pack_physics_step_jit(
+                    soc, temp, cur, True, sub_dt, ext_heat[r],
+                    capacity_ah[r], n_cells[r], num_modules[r])
+                remaining -= sub_dt
+        soc_out[r] = soc
+        temp_out[r] = temp
+        cell_v_out[r] = cell_v
+        pack_v_out[r] = pack_v
+    return soc_out, temp_out, cell_v_out, pack_v_out
+
+
+# Pack count from which ArrayController.step switches its physics pass
+# to the compiled batch kernel. Below this the per-object loop wins:
+# the kernel call plus gather/writeback costs more than N tiny steps.
+_BATCH_PHYSICS_MIN_PACKS = 16
+
+
+@_njit(cache=True, parallel=True)
+def _step_packs_kernel(soc: np.ndarray, temp: np.ndarray,
+                       current: np.ndarray, cell_v: np.ndarray,
+                       pack_v: np.ndarray, r_tot: np.ndarray,
+                       currents: np.ndarray, closed: np.ndarray,
+                       ext_heat: np.ndarray, dt: float,
+                       capacity_ah: np.ndarray, n_cells: np.ndarray,
+                       num_modules: np.ndarray):
+    """One array tick of pack physics for N packs, parallel over packs.
+
+    In-place update of the float64 state arrays; packs are independent
+    within a tick (the solver has already fixed each pack's current),
+    so the outer loop is a prange. Each lane runs the same scalar
+    kernel and dt subdivision as VirtualPack.step, making the batch
+    path bit-identical to the object path.
+    """
+    n = soc.shape[0]
+    for k in _prange(n):
+        s = soc[k]
+        T = temp[k]
+        i = current[k]
+        cv = cell_v[k]
+        pv = pack_v[k]
+        r = r_tot[k]
+        remaining = dt
+        while remaining > 0.0:
+            sub_dt = min(remaining, MAX_DT)
+            s, T, i, cv, pv, r = _pack_physics_step_jit(
+                s, T, currents[k], closed[k], sub_dt, ext_heat[k],
+                capacity_ah[k], n_cells[k], num_modules[k])
+            remaining -= sub_dt
+        soc[k] = s
+        temp[k] = T
+        current[k] = i
+        cell_v[k] = cv
+        pack_v[k] = pv
+        r_tot[k] = r
+
+
+# =====================================================================
+# ALARM KERNEL -- HW safety + SW alarm timers in one compiled pass
+# =====================================================================
+
+# _alarm_timers layout (all delay timers per Table 13):
+#   [0..2]  SE OV/UV/OT fault (5 s)
+#   [3..5]  SE OV/UV/OT warning (5 s, hysteresis deadband on clear)
+#   [6..8]  HW safety OV/UV/OT (1 s / 1 s / 5 s)
+#   [9]     overcurrent warning (10 s)
+#   [10]    overcurrent fault (5 s, charge at sub-zero only)
+_N_ALARM_TIMERS = 11
+
+# Status bits returned by _alarms_kernel
+_ST_HW_OV = 1 << 0
+_ST_HW_UV = 1 << 1
+_ST_HW_OT = 1 << 2
+_ST_SW_OV = 1 << 3
+_ST_SW_UV = 1 << 4
+_ST_SW_OT = 1 << 5
+_ST_WARN_OV = 1 << 6
+_ST_WARN_UV = 1 << 7
+_ST_WARN_OT = 1 << 8
+_ST_WARN_OC = 1 << 9
+_ST_FAULT_OC = 1 << 10
+
+_ST_WARN_MASK = _ST_WARN_OV | _ST_WARN_UV | _ST_WARN_OT | _ST_WARN_OC
+
+
+@_njit(cache=True)
+def _alarms_kernel(v: float, t: float, i: float, dt: float,
+                   timers: np.ndarray, tc: float, td: float) -> int:
+    """Advance all alarm delay timers and return a status bitmask.
+
+    Pure-numeric hot path for the >99% of ticks where nothing trips:
+    the caller only formats messages / mutates controller state for bits
+    that are set. Timers decay (leaky integrator) when their condition
+    is inactive; SE warning timers instead reset once the value passes
+    the hysteresis deadband.
+    """
+    status = 0
+
+    # -- HW safety -- Table 13: OV/UV 1s delay, OT 5s delay
+    if v >= HW_SAFETY_OVER_VOLTAGE:
+        timers[6] += dt
+        if timers[6] >= 1.0:
+            status |= _ST_HW_OV
+    else:
+        timers[6] = max(0.0, timers[6] - dt * FAULT_TIMER_DECAY_RATE)
+
+    if v <= HW_SAFETY_UNDER_VOLTAGE:
+        timers[7] += dt
+        if timers[7] >= 1.0:
+            status |= _ST_HW_UV
+    else:
+        timers[7] = max(0.0, timers[7] - dt * FAULT_TIMER_DECAY_RATE)
+
+    if t >= HW_SAFETY_OVER_TEMP:
+        timers[8] += dt
+        if timers[8] >= 5.0:
+            status |= _ST_HW_OT
+    else:
+        timers[8] = max(0.0, timers[8] - dt * FAULT_TIMER_DECAY_RATE)
+
+    # -- SE warnings (5s) with hysteresis deadband on clear --
+    if v >= SE_OVER_VOLTAGE_WARNING:
+        timers[3] += dt
+        if timers[3] >= 5.0:
+            status |= _ST_WARN_OV
+    elif v < SE_OV_WARN_CLEAR:
+        timers[3] = 0.0
+
+    if v <= SE_UNDER_VOLTAGE_WARNING:
+        timers[4] += dt
+        if timers[4] >= 5.0:
+            status |= _ST_WARN_UV
+    elif v > SE_UV_WARN_CLEAR:
+        timers[4] = 0.0
+
+    if t >= SE_OVER_TEMP_WARNING:
+        timers[5] += dt
+        if timers[5] >= 5.0:
+            status |= _ST_WARN_OT
+    elif t < SE_OT_WARN_CLEAR:
+        timers[5] = 0.0
+
+    # -- OVERCURRENT -- Table 13
+    # Warning: I > 1.05 × temp_charge_limit + 5A OR I < 1.05 × temp_discharge_limit – 5A
+    # Fix #5: discharge sign: -(1.05 * td - 5.0) makes threshold LESS negative (more sensitive)
+    oc_charge = i > 1.05 * tc + 5.0
+    oc_discharge = i < -(1.05 * td - 5.0)
+    if oc_charge or oc_discharge:
+        timers[9] += dt
+        if timers[9] >= 10.0:
+            status |= _ST_WARN_OC
+    else:
+        timers[9] = max(0.0, timers[9] - dt * FAULT_TIMER_DECAY_RATE)
+
+    # -- OC fault (5s) -- Fix #6: ONLY at T < 0°C AND charging per Table 13
+    if t < 0.0 and oc_charge:
+        timers[10] += dt
+        if timers[10] >= 5.0:
+            status |= _ST_FAULT_OC
+    else:
+        timers[10] = max(0.0, timers[10] - dt * FAULT_TIMER_DECAY_RATE)
+
+    # -- SE FAULTS (5s delay each) -- leaky integrator decay
+    if v >= SE_OVER_VOLTAGE_FAULT:
+        timers[0] += dt
+        if timers[0] >= 5.0:
+            status |= _ST_SW_OV
+    else:
+        timers[0] = max(0.0, timers[0] - dt * FAULT_TIMER_DECAY_RATE)
+
+    if v <= SE_UNDER_VOLTAGE_FAULT:
+        timers[1] += dt
+        if timers[1] >= 5.0:
+            status |= _ST_SW_UV
+    else:
+        timers[1] = max(0.0, timers[1] - dt * FAULT_TIMER_DECAY_RATE)
+
+    if t >= SE_OVER_TEMP_FAULT:
+        timers[2] += dt
+        if timers[2] >= 5.0:
+            status |= _ST_SW_OT
+    else:
+        timers[2] = max(0.0, timers[2] - dt * FAULT_TIMER_DECAY_RATE)
+
+    return status
+
+
+# Pre-rebind handle, mirroring _pack_physics_step_jit: the AOT rebind
+# below replaces _alarms_kernel with a plain C function that has no
+# py_func, so corvus_ext_build.py exports this alias instead.
+_alarms_kernel_jit = _alarms_kernel
+
+
+# Optional AOT-compiled kernels (see corvus_ext_build.py): when the
+# prebuilt extension is importable, bind the hot kernels to it so a fresh
+# process starts at full speed with no JIT warmup. Same code, same math;
+# the extension is compiled from these very functions.
+try:
+    import corvus_ext as _corvus_ext
+    _pack_physics_step = _corvus_ext.pack_step
+    _alarms_kernel = _corvus_ext.alarms
+except ImportError:
+    pass
+
+
+# =====================================================================
+# PACK CONTROLLER -- the real 7-mode state machine
+# =====================================================================
+
+@dataclass(slots=True)
 class PackController:
     """
     Implements the Orca ESS Pack Controller state machine and current
@@ -421,7 +981,7 @@ class PackController:
     sole driver of pack.step().
     """
     pack: VirtualPack
-    mode: PackMode = PackMode.READY
+    _mode: PackMode = PackMode.READY
     contactors_closed: bool = False
 
     charge_current_limit: float = NOMINAL_CAPACITY_AH
@@ -434,22 +994,12 @@ class PackController:
     warning_message: str = ""
     fault_message: str = ""
 
-    # SE alarm delay timers (5s each per Table 13)
-    _ov_fault_timer: float = 0.0
-    _uv_fault_timer: float = 0.0
-    _ot_fault_timer: float = 0.0
-    _ov_warn_timer: float = 0.0
-    _uv_warn_timer: float = 0.0
-    _ot_warn_timer: float = 0.0
-
-    # HW safety delay timers -- Table 13: OV/UV 1s, OT 5s
-    _hw_ov_timer: float = 0.0
-    _hw_uv_timer: float = 0.0
-    _hw_ot_timer: float = 0.0
+    # All alarm delay timers (see _alarm_timers layout comment above)
+    _alarm_timers: np.ndarray = field(
+        default_factory=lambda: np.zeros(_N_ALARM_TIMERS))
 
-    # Overcurrent timers -- Table 13: fault 5s, warning 10s
-    _oc_fault_timer: float = 0.0
-    _oc_warn_timer: float = 0.0
+    # Status bits from the previous tick, for edge-triggered formatting
+    _prev_status_bits: int = 0
 
     # Warning hold timer -- minimum time before clearing
     _warning_active_time: float = 0.0
@@ -460,6 +1010,20 @@ class PackController:
     # Fault reset safe-state accumulator
     _time_in_safe_state: float = 0.0
 
+    @property
+    def mode(self) -> PackMode:
+        return self._mode
+
+    @mode.setter
+    def mode(self, value: PackMode):
+        # Mode transitions are rare; bumping the epoch here lets the
+        # ArrayController keep its connected/ready lists cached across
+        # the many steps where nothing changes.
+        global _mode_epoch
+        if value is not self._mode:
+            _mode_epoch += 1
+            self._mode = value
+
     def request_connect(self, bus_voltage: float, for_charge: bool = True) -> bool:
         """
         Section 7.2: Evaluate safety conditions before closing contactors.
@@ -528,54 +1092,86 @@ class PackController:
         self.has_fault = False
         self.fault_message = ""
         self.mode = PackMode.READY
-        # Reset all timers
-        self._ov_fault_timer = 0.0
-        self._uv_fault_timer = 0.0
-        self._ot_fault_timer = 0.0
-        self._hw_ov_timer = 0.0
-        self._hw_uv_timer = 0.0
-        self._hw_ot_timer = 0.0
-        self._oc_fault_timer = 0.0
-        self._oc_warn_timer = 0.0
+        # Reset all timers (SE warning timers keep their hysteresis state)
+        self._alarm_timers[:3] = 0.0
+        self._alarm_timers[6:] = 0.0
         self._time_in_safe_state = 0.0
         return True
 
-    def _check_hw_safety(self, dt: float):
+    def _check_protections(self, dt: float):
         """
-        Section 6.2: Hardware Safety System -- INDEPENDENT of software faults.
-        Runs even when fault_latched is True. Runs in try/except.
-        Table 13: HW OV/UV = 1s delay, HW OT = 5s delay.
+        Sections 6.2 + 6.3.1, Table 13: HW safety and SW alarms.
+
+        All timer bookkeeping runs inside the compiled _alarms_kernel;
+        this wrapper only formats messages and mutates controller state
+        for status bits that are set. HW safety remains INDEPENDENT of
+        software faults (Fix #3): its bits are honored even when
+        fault_latched is True. The kernel is pure float arithmetic --
+        nothing in it can raise -- so no try/except wrapper is needed
+        (and none would survive compilation anyway).
         """
-        try:
-            v = self.pack.cell_voltage
-            t = self.pack.temperature
-
-            if v >= HW_SAFETY_OVER_VOLTAGE:
-                self._hw_ov_timer += dt
-                if self._hw_ov_timer >= 1.0:
-                    self._trigger_hw_fault(
-                        f"HW SAFETY: voltage {v:.3f}V >= {HW_SAFETY_OVER_VOLTAGE}V")
-            else:
-                self._hw_ov_timer = max(0.0, self._hw_ov_timer - dt * FAULT_TIMER_DECAY_RATE)
+        v = self.pack.cell_voltage
+        t = self.pack.temperature
+        i = self.pack.current
+        tc, td = _temp_current_limit(t, self.pack.capacity_ah)
+        status = _alarms_kernel(v, t, i, dt, self._alarm_timers, tc, td)
+        prev = self._prev_status_bits
+        self._prev_status_bits = status
+        rising = status & ~prev
+
+        # -- HW safety faults (edge-triggered: the latch and message
+        #    persist, so re-triggering on held bits would only re-format
+        #    the same string every tick) --
+        if rising & _ST_HW_OV:
+            self._trigger_hw_fault(
+                f"HW SAFETY: voltage {v:.3f}V >= {HW_SAFETY_OVER_VOLTAGE}V")
+        if rising & _ST_HW_UV:
+            self._trigger_hw_fault(
+                f"HW SAFETY: voltage {v:.3f}V <= {HW_SAFETY_UNDER_VOLTAGE}V")
+        if rising & _ST_HW_OT:
+            self._trigger_hw_fault(
+                f"HW SAFETY: temp {t:.1f}°C >= {HW_SAFETY_OVER_TEMP}°C")
 
-            if v <= HW_SAFETY_UNDER_VOLTAGE:
-                self._hw_uv_timer += dt
-                if self._hw_uv_timer >= 1.0:
-                    self._trigger_hw_fault(
-                        f"HW SAFETY: voltage {v:.3f}V <= {HW_SAFETY_UNDER_VOLTAGE}V")
-            else:
-                self._hw_uv_timer = max(0.0, self._hw_uv_timer - dt * FAULT_TIMER_DECAY_RATE)
+        # -- WARNINGS with hysteresis --
+        # Format only when the set of active warning bits changes; on a
+        # steady warning the message from the transition edge is kept.
+        warn_bits = status & _ST_WARN_MASK
+        if warn_bits:
+            self.has_warning = True
+            if warn_bits != (prev & _ST_WARN_MASK) or not self.warning_message:
+                warnings: list[str] = []
+                if warn_bits & _ST_WARN_OV:
+                    warnings.append(f"SE OV warning: {v:.3f}V")
+                if warn_bits & _ST_WARN_UV:
+                    warnings.append(f"SE UV warning: {v:.3f}V")
+                if warn_bits & _ST_WARN_OT:
+                    warnings.append(f"SE OT warning: {t:.1f}°C")
+                if warn_bits & _ST_WARN_OC:
+                    warnings.append(f"OC warning: I={i:.1f}A")
+                self.warning_message = "; ".join(warnings)
+            self._warning_active_time = 0.0  # Reset hold timer on new/continuing warning
+        elif self.has_warning:
+            self._warning_active_time += dt
+            if self._warning_active_time >= WARNING_HOLD_TIME:
+                self.has_warning = False
+                self.warning_message = ""
+                self._warning_active_time = 0.0
 
-            if t >= HW_SAFETY_OVER_TEMP:
-                self._hw_ot_timer += dt
-                if self._hw_ot_timer >= 5.0:
-                    self._trigger_hw_fault(
-                        f"HW SAFETY: temp {t:.1f}°C >= {HW_SAFETY_OVER_TEMP}°C")
-            else:
-                self._hw_ot_timer = max(0.0, self._hw_ot_timer - dt * FAULT_TIMER_DECAY_RATE)
-        except Exception as e:
-            # HW safety must never silently fail
-            self._trigger_hw_fault(f"HW SAFETY: exception during check: {e}")
+        # -- SW faults (latched) --
+        if self.fault_latched:
+            return
+        if status & _ST_FAULT_OC:
+            self._trigger_sw_fault(
+                f"OC fault: I={i:.1f}A at T={t:.1f}°C (charge at sub-zero)")
+        elif status & _ST_SW_OV:
+            self._trigger_sw_fault(
+                f"SE OV fault: {v:.3f}V >= {SE_OVER_VOLTAGE_FAULT}V")
+        elif status & _ST_SW_UV:
+            self._trigger_sw_fault(
+                f"SE UV fault: {v:.3f}V <= {SE_UNDER_VOLTAGE_FAULT}V")
+        elif status & _ST_SW_OT:
+            self._trigger_sw_fault(
+                f"SE OT fault: {t:.1f}°C >= {SE_OVER_TEMP_FAULT}°C")
 
     def _trigger_hw_fault(self, message: str):
         """Hardware safety fault -- always opens contactors, appends to fault_message."""
@@ -591,93 +1187,6 @@ class PackController:
         self.charge_current_limit = 0.0
         self.discharge_current_limit = 0.0
 
-    def _check_alarms(self, dt: float):
-        """Section 6.3.1 + Table 13: Check alarm conditions with delays."""
-        v = self.pack.cell_voltage
-        t = self.pack.temperature
-
-        # -- WARNINGS with hysteresis --
-        warnings: list[str] = []
-
-        if v >= SE_OVER_VOLTAGE_WARNING:
-            self._ov_warn_timer += dt
-            if self._ov_warn_timer >= 5.0:
-                warnings.append(f"SE OV warning: {v:.3f}V")
-        elif v < SE_OV_WARN_CLEAR:
-            self._ov_warn_timer = 0.0
-
-        if v <= SE_UNDER_VOLTAGE_WARNING:
-            self._uv_warn_timer += dt
-            if self._uv_warn_timer >= 5.0:
-                warnings.append(f"SE UV warning: {v:.3f}V")
-        elif v > SE_UV_WARN_CLEAR:
-            self._uv_warn_timer = 0.0
-
-        if t >= SE_OVER_TEMP_WARNING:
-            self._ot_warn_timer += dt
-            if self._ot_warn_timer >= 5.0:
-                warnings.append(f"SE OT warning: {t:.1f}°C")
-        elif t < SE_OT_WARN_CLEAR:
-            self._ot_warn_timer = 0.0
-
-        # -- OVERCURRENT -- Table 13
-        # Warning: I > 1.05 × temp_charge_limit + 5A OR I < 1.05 × temp_discharge_limit – 5A
-        # Fix #5: discharge sign: -(1.05 * td - 5.0) makes threshold LESS negative (more sensitive)
-        tc, td = _temp_current_limit(t, self.pack.capacity_ah)
-        i = self.pack.current
-        oc_charge = i > 1.05 * tc + 5.0
-        oc_discharge = i < -(1.05 * td - 5.0)  # Fix #5: -5A offset per Table 13
-        if oc_charge or oc_discharge:
-            self._oc_warn_timer += dt
-            if self._oc_warn_timer >= 10.0:
-                warnings.append(f"OC warning: I={i:.1f}A")
-        else:
-            self._oc_warn_timer = max(0.0, self._oc_warn_timer - dt * FAULT_TIMER_DECAY_RATE)
-
-        warn_active = len(warnings) > 0
-
-        # Update warning state with hold time
-        if warn_active:
-            self.has_warning = True
-            self.warning_message = "; ".join(warnings)
-            self._warning_active_time = 0.0  # Reset hold timer on new/continuing warning
-        elif self.has_warning:
-            self._warning_active_time += dt
-            if self._warning_active_time >= WARNING_HOLD_TIME:
-                self.has_warning = False
-                self.warning_message = ""
-                self._warning_active_time = 0.0
-
-        # -- OC fault (5s) -- Fix #6: ONLY at T < 0°C AND charging per Table 13
-        if t < 0.0 and oc_charge:
-            self._oc_fault_timer += dt
-            if self._oc_fault_timer >= 5.0 and not self.fault_latched:
-                self._trigger_sw_fault(f"OC fault: I={i:.1f}A at T={t:.1f}°C (charge at sub-zero)")
-        else:
-            self._oc_fault_timer = max(0.0, self._oc_fault_timer - dt * FAULT_TIMER_DECAY_RATE)
-
-        # -- SE FAULTS (5s delay each) -- leaky integrator decay
-        if v >= SE_OVER_VOLTAGE_FAULT:
-            self._ov_fault_timer += dt
-            if self._ov_fault_timer >= 5.0 and not self.fault_latched:
-                self._trigger_sw_fault(f"SE OV fault: {v:.3f}V >= {SE_OVER_VOLTAGE_FAULT}V")
-        else:
-            self._ov_fault_timer = max(0.0, self._ov_fault_timer - dt * FAULT_TIMER_DECAY_RATE)
-
-        if v <= SE_UNDER_VOLTAGE_FAULT:
-            self._uv_fault_timer += dt
-            if self._uv_fault_timer >= 5.0 and not self.fault_latched:
-                self._trigger_sw_fault(f"SE UV fault: {v:.3f}V <= {SE_UNDER_VOLTAGE_FAULT}V")
-        else:
-            self._uv_fault_timer = max(0.0, self._uv_fault_timer - dt * FAULT_TIMER_DECAY_RATE)
-
-        if t >= SE_OVER_TEMP_FAULT:
-            self._ot_fault_timer += dt
-            if self._ot_fault_timer >= 5.0 and not self.fault_latched:
-                self._trigger_sw_fault(f"SE OT fault: {t:.1f}°C >= {SE_OVER_TEMP_FAULT}°C")
-        else:
-            self._ot_fault_timer = max(0.0, self._ot_fault_timer - dt * FAULT_TIMER_DECAY_RATE)
-
     def _trigger_sw_fault(self, message: str):
         """Software fault -- opens contactors, latches."""
         self.has_fault = True
@@ -706,11 +1215,9 @@ class PackController:
         Control loop step -- computes limits, checks alarms, advances pre-charge.
         Does NOT call pack.step() (Fix #2: only ArrayController drives physics).
         """
-        # HW safety ALWAYS runs, independent of fault state (Fix #3)
-        self._check_hw_safety(dt)
-
-        # SW alarms
-        self._check_alarms(dt)
+        # HW safety + SW alarms; HW safety bits always honored,
+        # independent of fault state (Fix #3)
+        self._check_protections(dt)
 
         # Safe state timer for fault reset
         self._update_safe_state_timer(dt)
@@ -738,6 +1245,151 @@ class PackController:
         # The warning is an indication, not an additional derating layer.
 
 
+# Global mode-change epoch: bumped by every PackController mode
+# transition, compared by ArrayController to know when its cached
+# connected/ready lists are stale.
+_mode_epoch = 0
+
+
+# =====================================================================
+# KIRCHHOFF SOLVER KERNEL
+# =====================================================================
+
+@_njit(cache=True)
+def _kirchhoff_kernel(r: np.ndarray, g: np.ndarray, ocv: np.ndarray,
+                      cch: np.ndarray, cdc: np.ndarray, total: float,
+                      is_equalization: bool) -> Tuple[np.ndarray, float, bool]:
+    """Compiled clamp-and-remove loop of the Kirchhoff solver.
+
+    Pure numeric core over the position-indexed SoA arrays; runs every
+    ArrayController.step, so the iterate/clamp loop lives here as
+    explicit for-loops rather than interpreter-level array expressions.
+    The active set is the boolean mask `active` -- clamping a pack is a
+    single flag flip, O(1), where the solver once snapshotted a Python
+    list and called list.remove per clamp (O(N²) per iteration at
+    higher pack counts).
+    Returns (currents, v_bus, v_bus_valid); positions the solver never
+    resolved (degenerate sum_g) carry 0.0, matching the old dict-miss
+    default. v_bus_valid mirrors exactly the branches that used to
+    write self.bus_voltage.
+    """
+    n = r.shape[0]
+    ocv_g = ocv / r
+
+    # Fast path: solve once with every pack active and check all limits
+    # in one pass. During steady charging/discharging no limit binds, so
+    # the clamp loop below usually never runs; when a pack does violate,
+    # fall through and redo the bookkeeping from scratch.
+    sum_g = 0.0
+    sum_ocv_g = 0.0
+    for k in range(n):
+        sum_g += g[k]
+        sum_ocv_g += ocv_g[k]
+    if sum_g >= MIN_CONDUCTANCE:
+        if is_equalization:
+            v_bus = sum_ocv_g / sum_g
+        else:
+            v_bus = (sum_ocv_g + total) / sum_g
+        currents = np.empty(n)
+        clean = True
+        for k in range(n):
+            i_k = (v_bus - ocv[k]) / r[k]
+            if (i_k > 0 and i_k > cch[k]) or (i_k < 0 and -i_k > cdc[k]):
+                clean = False
+                break
+            currents[k] = i_k
+        if clean:
+            # No limit binds: the clamp loop and the post-solve
+            # tolerance check are both no-ops at this v_bus.
+            return currents, v_bus, True
+
+    active = np.ones(n, np.bool_)
+    n_active = n
+    currents = np.zeros(n)
+    clamped_sum = 0.0
+    residual = total
+    v_bus = 0.0
+
+    for _iteration in range(n):
+        if n_active == 0:
+            break
+
+        sum_g = 0.0
+        sum_ocv_g = 0.0
+        for k in range(n):
+            if active[k]:
+                sum_g += g[k]
+                sum_ocv_g += ocv_g[k]
+
+        if sum_g < MIN_CONDUCTANCE:
+            break
+
+        if is_equalization:
+            v_bus = (sum_ocv_g - clamped_sum) / sum_g
+        else:
+            v_bus = (sum_ocv_g + residual) / sum_g
+
+        any_clamped = False
+        for k in range(n):
+            if not active[k]:
+                continue
+            i_k = (v_bus - ocv[k]) / r[k]
+            if i_k > 0 and i_k > cch[k]:
+                currents[k] = cch[k]
+            elif i_k < 0 and -i_k > cdc[k]:
+                currents[k] = -cdc[k]
+            else:
+                currents[k] = i_k
+                continue
+            clamped_sum += currents[k]
+            if not is_equalization:
+                residual -= currents[k]
+            active[k] = False
+            n_active -= 1
+            any_clamped = True
+
+        if not any_clamped:
+            if not is_equalization:
+                # Post-solve assertion -- clamp and accept small KCL violation
+                tol = 1.0 + CURRENT_LIMIT_TOLERANCE
+                for k in range(n):
+                    if currents[k] > 0 and currents[k] > cch[k] * tol:
+                        currents[k] = cch[k]
+                    elif currents[k] < 0 and -currents[k] > cdc[k] * tol:
+                        currents[k] = -cdc[k]
+            return currents, v_bus, True
+
+    # Final solve with remaining active packs
+    if n_active > 0:
+        sum_g = 0.0
+        sum_ocv_g = 0.0
+        for k in range(n):
+            if active[k]:
+                sum_g += g[k]
+                sum_ocv_g += ocv_g[k]
+        if sum_g > MIN_CONDUCTANCE:
+            if is_equalization:
+                v_bus = (sum_ocv_g - clamped_sum) / sum_g
+            else:
+                v_bus = (sum_ocv_g + residual) / sum_g
+            for k in range(n):
+                if active[k]:
+                    currents[k] = (v_bus - ocv[k]) / r[k]
+            return currents, v_bus, True
+        # Degenerate conductance: unresolved packs carry no current
+        for k in range(n):
+            if active[k]:
+                currents[k] = 0.0
+        return currents, v_bus, False
+    elif n_active < n:
+        v_sum = 0.0
+        for k in range(n):
+            v_sum += ocv[k] + currents[k] * r[k]
+        return currents, v_sum / n, True
+
+    return currents, v_bus, False
+
+
 # =====================================================================
 # ARRAY CONTROLLER
 # =====================================================================
@@ -755,11 +1407,32 @@ class ArrayController:
     array_charge_limit: float = 0.0
     array_discharge_limit: float = 0.0
 
+    # Cached connected/ready lists, rebuilt (in controller order) only
+    # when the global mode epoch moves
+    _conn_cache: List[PackController] = field(init=False, default_factory=list)
+    _ready_cache: List[PackController] = field(init=False, default_factory=list)
+    _cache_epoch: int = field(init=False, default=-1)
+
+    # Reusable solver scratch: one (5, capacity) block refilled in place
+    # each solve instead of five fresh arrays per call. Grows on demand.
+    _soa_buf: np.ndarray = field(init=False,
+                                 default_factory=lambda: np.empty((5, 0)))
+
+    def _refresh_mode_caches(self):
+        if self._cache_epoch != _mode_epoch:
+            self._conn_cache = [c for c in self.controllers
+                                if c.mode == PackMode.CONNECTED]
+            self._ready_cache = [c for c in self.controllers
+                                 if c.mode == PackMode.READY]
+            self._cache_epoch = _mode_epoch
+
     def _connected(self) -> List[PackController]:
-        return [c for c in self.controllers if c.mode == PackMode.CONNECTED]
+        self._refresh_mode_caches()
+        return self._conn_cache
 
     def _ready(self) -> List[PackController]:
-        return [c for c in self.controllers if c.mode == PackMode.READY]
+        self._refresh_mode_caches()
+        return self._ready_cache
 
     def connect_first(self, for_charge: bool = True):
         """
@@ -787,11 +1460,14 @@ class ArrayController:
         Fix #9: After first pack is connected, remaining packs connect
         SIMULTANEOUSLY (not one-at-a-time) if voltage/SoC in range.
         """
-        conn = self._connected()
-        if not conn:
+        ready = self._ready()
+        if not ready:
+            return  # Nothing left to connect -- the steady state for
+                    # most of the run once all packs are on the bus
+
+        if not self._connected():
             return  # Need first pack connected first
 
-        ready = self._ready()
         for ctrl in ready:
             ctrl.request_connect(self.bus_voltage, for_charge=for_charge)
 
@@ -810,22 +1486,64 @@ class ArrayController:
         if not conn:
             ready = self._ready()
             if ready:
-                self.bus_voltage = float(np.mean([c.pack.pack_voltage for c in ready]))
+                # Plain sum/len: np.mean on a handful of floats is all
+                # array-construction overhead
+                self.bus_voltage = sum(c.pack.pack_voltage for c in ready) / len(ready)
 
     def compute_array_limits(self):
         """Section 7.4: array limit = min(per-pack limit) × N connected."""
-        conn = self._connected()
+        self._compute_array_limits(self._connected())
+
+    def _compute_array_limits(self, conn: List[PackController]):
+        """Limit computation for an already-collected connected list.
+
+        Single pass with local minima instead of two generator scans;
+        runs twice per tick, so the attribute re-walk was paid four
+        times per step.
+        """
         if not conn:
             self.array_charge_limit = 0.0
             self.array_discharge_limit = 0.0
             return
+        min_c = min_d = float('inf')
+        for c in conn:
+            if c.charge_current_limit < min_c:
+                min_c = c.charge_current_limit
+            if c.discharge_current_limit < min_d:
+                min_d = c.discharge_current_limit
         n = len(conn)
-        self.array_charge_limit = min(c.charge_current_limit for c in conn) * n
-        self.array_discharge_limit = min(c.discharge_current_limit for c in conn) * n
+        self.array_charge_limit = min_c * n
+        self.array_discharge_limit = min_d * n
+
+    def _refresh_soa(self, conn: List[PackController]):
+        """Gather per-pack solver inputs into position-indexed arrays.
+
+        Structure-of-Arrays view of conn: resistance, conductance, pack
+        OCV, and the two current limits, indexed by position. The
+        solver then runs on whole arrays with a boolean active mask
+        instead of walking PackController objects and mutating a list
+        each iteration. Conductance comes from the g_total cache on the
+        pack, not a fresh division.
+
+        The rows are views into the reusable _soa_buf scratch block,
+        refilled in place each call -- no per-solve allocations.
+        """
+        n = len(conn)
+        if self._soa_buf.shape[1] < n:
+            self._soa_buf = np.empty((5, max(n, 2 * self._soa_buf.shape[1])))
+        buf = self._soa_buf
+        for k, c in enumerate(conn):
+            p = c.pack
+            buf[0, k] = p.r_total
+            buf[1, k] = p.g_total
+            buf[2, k] = p.ocv_pack
+            buf[3, k] = c.charge_current_limit
+            buf[4, k] = c.discharge_current_limit
+        return buf[0, :n], buf[1, :n], buf[2, :n], buf[3, :n], buf[4, :n]
 
     def _solve_currents(self, conn: List[PackController],
                         target_current: float,
-                        is_equalization: bool = False) -> Dict[int, float]:
+                        is_equalization: bool = False) -> np.ndarray:
         """
         Unified Kirchhoff/equalization solver with per-pack limit enforcement.
 
@@ -837,9 +1555,15 @@ class ArrayController:
           target_current = 0.0, KCL: ΣI_k = 0
           Clamped packs' currents are absorbed by unclamped packs via
           V_bus = (Σ(OCV_k/R_k) - clamped_sum) / Σ(1/R_k)
+
+        Thin wrapper: clamps the request to the array limits, gathers
+        the SoA arrays, and hands the iterate/clamp loop to the
+        compiled _kirchhoff_kernel. Returns the solved currents as an
+        array indexed by position in conn (packs the solver could not
+        resolve carry 0.0) -- no dict in the hot path.
         """
         if not conn:
-            return {}
+            return np.empty(0)
 
         # Clamp total requested current to array limits (Kirchhoff only)
         if not is_equalization:
@@ -852,83 +1576,13 @@ class ArrayController:
         else:
             actual_total = 0.0
 
-        active = list(conn)
-        clamped: Dict[int, float] = {}
-        residual = actual_total
-
-        for _iteration in range(len(conn)):
-            if not active:
-                break
-
-            sum_g = sum(1.0 / c.pack.r_total for c in active)
-            sum_ocv_g = sum(c.pack.ocv_pack / c.pack.r_total for c in active)
-
-            if sum_g < MIN_CONDUCTANCE:
-                break
-
-            if is_equalization:
-                clamped_sum = sum(clamped.values())
-                v_bus = (sum_ocv_g - clamped_sum) / sum_g
-            else:
-                v_bus = (sum_ocv_g + residual) / sum_g
+        r, g, ocv, cch, cdc = self._refresh_soa(conn)
+        currents, v_bus, v_bus_valid = _kirchhoff_kernel(
+            r, g, ocv, cch, cdc, actual_total, is_equalization)
+        if v_bus_valid:
+            self.bus_voltage = v_bus
 
-            pack_currents: Dict[int, float] = {}
-            any_clamped = False
-            for c in list(active):
-                i_k = (v_bus - c.pack.ocv_pack) / c.pack.r_total
-                if i_k > 0 and i_k > c.charge_current_limit:
-                    clamped[c.pack.pack_id] = c.charge_current_limit
-                    if not is_equalization:
-                        residual -= c.charge_current_limit
-                    active.remove(c)
-                    any_clamped = True
-                elif i_k < 0 and abs(i_k) > c.discharge_current_limit:
-                    clamped[c.pack.pack_id] = -c.discharge_current_limit
-                    if not is_equalization:
-                        residual -= (-c.discharge_current_limit)
-                    active.remove(c)
-                    any_clamped = True
-                else:
-                    pack_currents[c.pack.pack_id] = i_k
-
-            if not any_clamped:
-                self.bus_voltage = v_bus
-                pack_currents.update(clamped)
-
-                if not is_equalization:
-                    # Post-solve assertion -- clamp and accept small KCL violation
-                    tol = 1.0 + CURRENT_LIMIT_TOLERANCE
-                    for c in conn:
-                        pid = c.pack.pack_id
-                        ik = pack_currents.get(pid, 0.0)
-                        if ik > 0 and ik > c.charge_current_limit * tol:
-                            pack_currents[pid] = c.charge_current_limit
-                        elif ik < 0 and abs(ik) > c.discharge_current_limit * tol:
-                            pack_currents[pid] = -c.discharge_current_limit
-
-                return pack_currents
-
-        # Final solve with remaining active packs
-        if active:
-            sum_g = sum(1.0 / c.pack.r_total for c in active)
-            sum_ocv_g = sum(c.pack.ocv_pack / c.pack.r_total for c in active)
-            if sum_g > MIN_CONDUCTANCE:
-                if is_equalization:
-                    clamped_sum = sum(clamped.values())
-                    v_bus = (sum_ocv_g - clamped_sum) / sum_g
-                else:
-                    v_bus = (sum_ocv_g + residual) / sum_g
-                self.bus_voltage = v_bus
-                for c in active:
-                    clamped[c.pack.pack_id] = (v_bus - c.pack.ocv_pack) / c.pack.r_total
-        elif clamped:
-            voltages = []
-            for c in conn:
-                i_k = clamped.get(c.pack.pack_id, 0.0)
-                voltages.append(c.pack.ocv_pack + i_k * c.pack.r_total)
-            self.bus_voltage = float(np.mean(voltages))
-
-        return clamped
+        return currents
 
     def step(self, dt: float, requested_current: float,
              external_heat: Optional[Dict[int, float]] = None):
@@ -940,40 +1594,100 @@ class ArrayController:
 
         Order: step controllers (limits/alarms) → solve currents → step physics.
         Fix #2: Only this method drives pack.step().
+
+        Single-traversal layout: modes only change inside ctrl.step, so
+        the connected list collected in pass 1 stays valid for the whole
+        tick; physics for connected and idle packs runs in one fused
+        pass (pack steps are independent once the solve is done), and
+        the final limit refresh reuses the same list instead of
+        rebuilding it.
         """
-        # 1. Step all controllers (alarms, limits, mode transitions)
+        # 1. Step all controllers (alarms, limits, mode transitions) and
+        #    collect the connected set in the same pass
+        conn = []
         for ctrl in self.controllers:
             ctrl.step(dt, self.bus_voltage)
-
-        conn = self._connected()
+            if ctrl.mode == PackMode.CONNECTED:
+                conn.append(ctrl)
 
         # 2. Solve current distribution
         if conn:
             # Compute limits BEFORE solving so they're fresh on the first connected timestep
-            self.compute_array_limits()
+            self._compute_array_limits(conn)
 
             if requested_current != 0:
-                pack_currents = self._solve_currents(conn, requested_current)
+                currents = self._solve_currents(conn, requested_current)
             else:
                 # Equalization currents at zero load
-                pack_currents = self._solve_currents(conn, 0.0, is_equalization=True)
-
-            # 3. Step physics for connected packs with solved currents
-            for ctrl in conn:
-                i_k = pack_currents.get(ctrl.pack.pack_id, 0.0)
-                ext_h = (external_heat or {}).get(ctrl.pack.pack_id, 0.0)
-                ctrl.pack.step(dt, i_k, ctrl.contactors_closed, ext_h)
+                currents = self._solve_currents(conn, 0.0, is_equalization=True)
         else:
             self.update_bus_voltage()
-
-        # Step physics for non-connected packs (zero current)
-        for ctrl in self.controllers:
-            if ctrl.mode != PackMode.CONNECTED:
-                ext_h = (external_heat or {}).get(ctrl.pack.pack_id, 0.0)
-                ctrl.pack.step(dt, 0.0, ctrl.contactors_closed, ext_h)
-
-        self.compute_array_limits()
-        return self._connected()
+            currents = np.empty(0)
+
+        # 3. Step physics: solved current for connected packs, zero for
+        #    everyone else. Connected controllers appear in conn order,
+        #    so a running index into the solved array replaces the old
+        #    pack_id dict lookups. Large arrays go through the compiled
+        #    batch kernel; small ones stay on the cheaper per-object
+        #    loop.
+        ext = external_heat or {}
+        if HAVE_NUMBA and len(self.controllers) >= _BATCH_PHYSICS_MIN_PACKS:
+            self._step_physics_batched(dt, currents, ext)
+        else:
+            ci = 0
+            for ctrl in self.controllers:
+                if ctrl.mode == PackMode.CONNECTED:
+                    i_k = float(currents[ci])
+                    ci += 1
+                else:
+                    i_k = 0.0
+                ctrl.pack.step(dt, i_k, ctrl.contactors_closed,
+                               ext.get(ctrl.pack.pack_id, 0.0))
+
+        self._compute_array_limits(conn)
+        return conn
+
+    def _step_physics_batched(self, dt: float, solved: np.ndarray,
+                              ext: Dict[int, float]):
+        """Physics pass through _step_packs_kernel (parallel over packs).
+
+        Gathers per-pack state into float64 SoA arrays, runs the
+        compiled kernel, and writes the results back onto the
+        VirtualPack objects (including the r_total/g_total caches).
+        Bit-identical to the per-object loop; only worth the gather and
+        writeback above _BATCH_PHYSICS_MIN_PACKS packs.
+        """
+        ctrls = self.controllers
+        packs = [c.pack for c in ctrls]
+        soc = np.array([p.soc for p in packs])
+        temp = np.array([p.temperature for p in packs])
+        current = np.array([p.current for p in packs])
+        cell_v = np.array([p.cell_voltage for p in packs])
+        pack_v = np.array([p.pack_voltage for p in packs])
+        r_tot = np.array([p.r_total for p in packs])
+        currents = np.zeros(len(ctrls))
+        ci = 0
+        for k, c in enumerate(ctrls):
+            if c.mode == PackMode.CONNECTED:
+                currents[k] = solved[ci]
+                ci += 1
+        closed = np.array([c.contactors_closed for c in ctrls], dtype=np.bool_)
+        ext_h = np.array([ext.get(p.pack_id, 0.0) for p in packs])
+        cap = np.array([p.capacity_ah for p in packs])
+        n_cells = np.array([p.num_cells_series for p in packs], dtype=np.int64)
+        n_mod = np.array([p.num_modules for p in packs], dtype=np.int64)
+
+        _step_packs_kernel(soc, temp, current, cell_v, pack_v, r_tot,
+                           currents, closed, ext_h, dt, cap, n_cells, n_mod)
+
+        for k, p in enumerate(packs):
+            p.soc = float(soc[k])
+            p.temperature = float(temp[k])
+            p.current = float(current[k])
+            p.cell_voltage = float(cell_v[k])
+            p.pack_voltage = float(pack_v[k])
+            p.r_total = float(r_tot[k])
+            p.g_total = 1.0 / p.r_total
 
 
 # =====================================================================
@@ -1027,27 +1741,41 @@ def _run_scenario_inner(output_dir: str = "."):
     array.update_bus_voltage()
 
     dt = 1.0
-    data_rows = []
     events = []
 
+    # Preallocated recording buffer: one float64 row per dt instead of a
+    # 31-key dict per step (~28k hash inserts over the run). Numeric
+    # telemetry goes in data_num (4 array columns + 7 per pack); the
+    # mode enum goes in a parallel int8 array and is mapped back to its
+    # name at CSV time. Doubles on overflow; phase lengths vary a little
+    # (fault timing), so capacity is a generous upper bound, not exact.
+    n_packs = len(controllers)
+    data_num = np.empty((2048, 4 + 7 * n_packs))
+    data_mode = np.empty((2048, n_packs), dtype=np.int8)
+    n_rows = 0
+
     def record(t):
-        row = {
-            'time': t,
-            'bus_voltage': array.bus_voltage,
-            'array_charge_limit': array.array_charge_limit,
-            'array_discharge_limit': array.array_discharge_limit,
-        }
+        nonlocal data_num, data_mode, n_rows
+        if n_rows == data_num.shape[0]:
+            data_num = np.concatenate([data_num, np.empty_like(data_num)])
+            data_mode = np.concatenate([data_mode, np.empty_like(data_mode)])
+        row = data_num[n_rows]
+        row[0] = t
+        row[1] = array.bus_voltage
+        row[2] = array.array_charge_limit
+        row[3] = array.array_discharge_limit
         for i, ctrl in enumerate(controllers):
-            p = f'pack{i+1}'
-            row[f'{p}_soc'] = ctrl.pack.soc * 100
-            row[f'{p}_voltage'] = ctrl.pack.pack_voltage
-            row[f'{p}_cell_v'] = ctrl.pack.cell_voltage
-            row[f'{p}_temp'] = ctrl.pack.temperature
-            row[f'{p}_current'] = ctrl.pack.current
-            row[f'{p}_charge_limit'] = ctrl.charge_current_limit
-            row[f'{p}_discharge_limit'] = ctrl.discharge_current_limit
-            row[f'{p}_mode'] = ctrl.mode.name
-        data_rows.append(row)
+            base = 4 + 7 * i
+            p = ctrl.pack
+            row[base] = p.soc * 100
+            row[base + 1] = p.pack_voltage
+            row[base + 2] = p.cell_voltage
+            row[base + 3] = p.temperature
+            row[base + 4] = p.current
+            row[base + 5] = ctrl.charge_current_limit
+            row[base + 6] = ctrl.discharge_current_limit
+            data_mode[n_rows, i] = ctrl.mode
+        n_rows += 1
 
     # ── PHASE 1: Connect to charge (t=0..30s) ──
     # First pack by lowest SoC, then remaining simultaneously
@@ -1286,26 +2014,60 @@ def _run_scenario_inner(output_dir: str = "."):
     print()
 
     # ── Write CSV ──
+    header = ['time', 'bus_voltage', 'array_charge_limit', 'array_discharge_limit']
+    for i in range(n_packs):
+        p = f'pack{i+1}'
+        header += [f'{p}_soc', f'{p}_voltage', f'{p}_cell_v', f'{p}_temp',
+                   f'{p}_current', f'{p}_charge_limit', f'{p}_discharge_limit',
+                   f'{p}_mode']
+
+    # tolist() round-trips float64 through repr, so the CSV text is
+    # identical to what the per-step dicts produced
+    mode_names = {m.value: m.name for m in PackMode}
+    rows = []
+    for nums, ms in zip(data_num[:n_rows].tolist(), data_mode[:n_rows].tolist()):
+        row = nums[:4]
+        for i in range(n_packs):
+            row += nums[4 + 7 * i:11 + 7 * i]
+            row.append(mode_names[ms[i]])
+        rows.append(row)
+
     csv_path = os.path.join(output_dir, "corvus_output.csv")
-    with open(csv_path, 'w', newline='') as f:
-        w = csv.DictWriter(f, fieldnames=data_rows[0].keys())
-        w.writeheader()
-        w.writerows(data_rows)
-    print(f"[Output] CSV: {csv_path} ({len(data_rows)} rows)")
+    # 1 MiB write buffer: the whole file goes out in one flush instead
+    # of a syscall every few rows
+    with open(csv_path, 'w', newline='', buffering=1 << 20) as f:
+        w = csv.writer(f)
+        w.writerow(header)
+        w.writerows(rows)
+    print(f"[Output] CSV: {csv_path} ({n_rows} rows)")
 
     # ── Plot ──
     plot_path = os.path.join(output_dir, "corvus_plot.png")
-    _make_plot(data_rows, events, plot_path)
+    _make_plot(data_num[:n_rows], data_mode[:n_rows], events, plot_path)
     print(f"[Output] Plot: {plot_path}")
     print("\nDone.")
 
 
-def _make_plot(data, events, path):
+def _make_plot(data, modes, events, path):
+    """Render the 5-panel scenario plot from the recording buffer.
+
+    data is the (n_rows, 4 + 7*n_packs) float64 buffer from record();
+    modes the parallel int8 mode array. Every series is a contiguous
+    column slice, so each ax.plot gets an ndarray view instead of a
+    list comprehension over per-step dicts.
+    """
     import matplotlib
     matplotlib.use('Agg')
     import matplotlib.pyplot as plt
 
-    t = [r['time'] for r in data]
+    # Column offsets within a pack's 7-column block (see record())
+    S_SOC, S_CELL_V, S_TEMP, S_CURRENT, S_CHG_LIM = 0, 2, 3, 4, 5
+
+    def cols(offset):
+        """(T, 3) matrix of one per-pack series -- one ax.plot per panel."""
+        return data[:, [4 + 7 * i + offset for i in range(3)]]
+
+    t = data[:, 0]
     fig, axes = plt.subplots(5, 1, figsize=(16, 20), sharex=True)
     fig.suptitle(
         "Corvus Orca ESS Demo v4 -- 3-Pack Scenario\n"
@@ -1316,10 +2078,22 @@ def _make_plot(data, events, path):
     colors = ['#2196F3', '#4CAF50', '#FF5722']
     labels = ['Pack 1 (45%)', 'Pack 2 (55%)', 'Pack 3 (65%)']
 
+    def plot_packs(ax, m, pack_labels, **kwargs):
+        """Plot one (T, 3) matrix as three pack lines in a single call.
+
+        One ax.plot with a 2-D y emits all lines with shared setup
+        instead of three separate calls; the prop cycle supplies the
+        per-pack colors and labels are attached to the returned lines.
+        """
+        ax.set_prop_cycle(color=colors)
+        lines = ax.plot(t, m, **kwargs)
+        for line, lab in zip(lines, pack_labels):
+            line.set_label(lab)
+        return lines
+
     # SoC
     ax = axes[0]
-    for i in range(3):
-        ax.plot(t, [r[f'pack{i+1}_soc'] for r in data], color=colors[i], label=labels[i], lw=1.5)
+    plot_packs(ax, cols(S_SOC), labels, lw=1.5)
     ax.set_ylabel('SoC (%)')
     ax.set_title('State of Charge -- Section 2.3')
     ax.legend(loc='upper left', fontsize=8)
@@ -1327,8 +2101,7 @@ def _make_plot(data, events, path):
 
     # Cell Voltage
     ax = axes[1]
-    for i in range(3):
-        ax.plot(t, [r[f'pack{i+1}_cell_v'] for r in data], color=colors[i], label=labels[i], lw=1.5)
+    plot_packs(ax, cols(S_CELL_V), labels, lw=1.5)
     ax.axhline(SE_OVER_VOLTAGE_WARNING, color='orange', ls='--', alpha=0.7, label=f'OV Warn ({SE_OVER_VOLTAGE_WARNING}V)')
     ax.axhline(SE_OVER_VOLTAGE_FAULT, color='red', ls='--', alpha=0.7, label=f'OV Fault ({SE_OVER_VOLTAGE_FAULT}V)')
     ax.set_ylabel('Cell Voltage (V)')
@@ -1338,8 +2111,7 @@ def _make_plot(data, events, path):
 
     # Temperature
     ax = axes[2]
-    for i in range(3):
-        ax.plot(t, [r[f'pack{i+1}_temp'] for r in data], color=colors[i], label=labels[i], lw=1.5)
+    plot_packs(ax, cols(S_TEMP), labels, lw=1.5)
     ax.axhline(SE_OVER_TEMP_WARNING, color='orange', ls='--', alpha=0.7, label=f'OT Warn ({SE_OVER_TEMP_WARNING}°C)')
     ax.axhline(SE_OVER_TEMP_FAULT, color='red', ls='--', alpha=0.7, label=f'OT Fault ({SE_OVER_TEMP_FAULT}°C)')
     ax.axhline(HW_SAFETY_OVER_TEMP, color='darkred', ls=':', alpha=0.7, label=f'HW Safety ({HW_SAFETY_OVER_TEMP}°C)')
@@ -1350,38 +2122,40 @@ def _make_plot(data, events, path):
 
     # Current
     ax = axes[3]
-    for i in range(3):
-        ax.plot(t, [r[f'pack{i+1}_current'] for r in data], color=colors[i], lw=1.5,
-                label=f'Pack {i+1} current')
-        ax.plot(t, [r[f'pack{i+1}_charge_limit'] for r in data], color=colors[i], ls='--', alpha=0.4, lw=1,
-                label=f'Pack {i+1} charge lim')
+    plot_packs(ax, cols(S_CURRENT),
+               [f'Pack {i+1} current' for i in range(3)], lw=1.5)
+    plot_packs(ax, cols(S_CHG_LIM),
+               [f'Pack {i+1} charge lim' for i in range(3)],
+               ls='--', alpha=0.4, lw=1)
     ax.set_ylabel('Current (A)')
     ax.set_title('Pack Currents & Limits -- Kirchhoff Distribution')
     ax.legend(loc='upper right', fontsize=7, ncol=2)
     ax.grid(True, alpha=0.3)
 
-    # Pack Modes
+    # Pack Modes -- int8 enum values are 1-based; the y axis is 0-based
     ax = axes[4]
-    mode_map = {m.name: i for i, m in enumerate(PackMode)}
-    for i in range(3):
-        modes = [mode_map[r[f'pack{i+1}_mode']] for r in data]
-        ax.plot(t, modes, color=colors[i], label=labels[i], lw=2, drawstyle='steps-post')
-    ax.set_yticks(list(mode_map.values()))
-    ax.set_yticklabels(list(mode_map.keys()), fontsize=8)
+    plot_packs(ax, modes - 1, labels, lw=2, drawstyle='steps-post')
+    ax.set_yticks(range(len(PackMode)))
+    ax.set_yticklabels([m.name for m in PackMode], fontsize=8)
     ax.set_ylabel('Pack Mode')
     ax.set_xlabel('Time (s)')
     ax.set_title('Pack Operation Modes -- Table 15, Section 7.1')
     ax.legend(loc='upper right', fontsize=8)
     ax.grid(True, alpha=0.3)
 
-    # Event annotations
+    # Event annotations -- one LineCollection per axis via vlines
+    # instead of an axvline artist per event per axis
+    event_ts = np.fromiter((e[0] for e in events), dtype=float)
+    y0, y1 = axes[0].get_ylim()
+    axes[0].vlines(event_ts, y0, y1, colors='gray', linestyles=':', alpha=0.5)
+    axes[0].set_ylim(y0, y1)
     for et, etxt in events:
-        axes[0].axvline(et, color='gray', ls=':', alpha=0.5)
-        axes[0].annotate(etxt, xy=(et, axes[0].get_ylim()[1]), fontsize=6, ha='center', va='top',
+        axes[0].annotate(etxt, xy=(et, y1), fontsize=6, ha='center', va='top',
                          bbox=dict(boxstyle='round,pad=0.3', fc='yellow', alpha=0.7))
-    for et, _ in events:
-        for ax in axes[1:]:
-            ax.axvline(et, color='gray', ls=':', alpha=0.3)
+    for ax in axes[1:]:
+        y0, y1 = ax.get_ylim()
+        ax.vlines(event_ts, y0, y1, colors='gray', linestyles=':', alpha=0.3)
+        ax.set_ylim(y0, y1)
 
     plt.tight_layout()
     plt.savefig(path, dpi=150, bbox_inches='tight')
@@ -4,49 +4,302 @@ plot_firmware.py — Plot Corvus Orca ESS firmware demo output
 
 Reads CSV from stdin or file argument, generates a 5-panel dark-theme plot.
 Saves to firmware_plot.png in the parent directory.
+
+Importable as a module: render(path) returns the finished figure, and a
+batch driver replotting many logs can pass the same figure back in to
+reuse one Agg canvas instead of rebuilding it per log.
 """
 
 import sys
-import csv
 import os
 import matplotlib
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import numpy as np
 
+# One-shot PNG render: lean on path simplification (sub-pixel vertices
+# are invisible at dpi=150) and split very long paths so Agg's stroker
+# works on cache-sized chunks.
+plt.rcParams['path.simplify'] = True
+plt.rcParams['path.simplify_threshold'] = 1.0
+plt.rcParams['agg.path.chunksize'] = 10000
+
+plt.style.use('dark_background')
+
+# pandas is the fastest parse path (C tokenizer straight into typed
+# column buffers); the script falls back to structured np.loadtxt when
+# it is not installed.
+try:
+    import pandas as pd
+    HAVE_PANDAS = True
+except ImportError:
+    HAVE_PANDAS = False
+
+# numba gives a second fast path when pandas is absent: the whole file
+# is read as one byte buffer and a compiled scanner writes fields
+# straight into preallocated typed arrays, with no per-row Python
+# objects at all.
+try:
+    from numba import njit as _njit
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+    def _njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when numba is not installed."""
+        if args and callable(args[0]):
+            return args[0]
+
+        def wrap(fn):
+            return fn
+        return wrap
+
 # ── Read CSV ─────────────────────────────────────────────────────────
-if len(sys.argv) > 1:
-    f = open(sys.argv[1], 'r')
-else:
-    f = sys.stdin
-
-reader = csv.DictReader(f)
-rows = list(reader)
-if f is not sys.stdin:
-    f.close()
-
-if not rows:
-    print("No data!", file=sys.stderr)
-    sys.exit(1)
-
-t = np.array([float(r['time_s']) for r in rows])
-soc = np.array([float(r['soc_pct']) for r in rows])
-cell_mv = np.array([float(r['cell_mv']) for r in rows])
-temp_dc = np.array([float(r['temperature_deci_c']) for r in rows])
-current = np.array([float(r['current_ma']) for r in rows])
-chg_lim = np.array([float(r['charge_limit_ma']) for r in rows])
-dchg_lim = np.array([float(r['discharge_limit_ma']) for r in rows])
-mode = np.array([int(r['mode']) for r in rows])
-contactor = np.array([int(r['contactor_state']) for r in rows])
-warnings = np.array([int(r['warnings']) for r in rows])
-faults = np.array([int(r['faults']) for r in rows])
-
-# Convert units
-cell_v = cell_mv / 1000.0
-temp_c = temp_dc / 10.0
-current_a = current / 1000.0
-chg_lim_a = chg_lim / 1000.0
-dchg_lim_a = dchg_lim / 1000.0
+# Every path hands back typed NumPy columns with no per-row Python
+# objects: pandas.read_csv with explicit dtypes, a numba-compiled byte
+# scanner, or a csv.reader stream written directly into column arrays.
+# float32 is plenty for plotted telemetry and the small enum/flag
+# columns fit in int8; faults carries the full bms_fault_flags_t word
+# (13 bits today) and needs int16.
+CSV_FIELD_TYPES = 'f8,f4,f4,f4,f4,f4,f4,i1,i1,i1,i2'
+
+CSV_PANDAS_DTYPES = {
+    'time_s': 'float64', 'soc_pct': 'float32', 'cell_mv': 'float32',
+    'temperature_deci_c': 'float32', 'current_ma': 'float32',
+    'charge_limit_ma': 'float32', 'discharge_limit_ma': 'float32',
+    'mode': 'int8', 'contactor_state': 'int8',
+    'warnings': 'int8', 'faults': 'int16',
+}
+
+CSV_FIELD_NAMES = list(CSV_PANDAS_DTYPES)
+
+@_njit(cache=True)
+def _scan_rows(buf, out_t, out_sig, out_int, out_faults):
+    """Parse the CSV body in ``buf`` into preallocated column arrays.
+
+    Hand-rolled atof/atoi over the raw bytes in a single pass: column 0
+    is time (float64), columns 1-6 the float32 telemetry signals,
+    columns 7-9 the int8 enum/flag fields, column 10 the int16 fault
+    word.
+    """
+    n = buf.shape[0]
+    pos = 0
+    for row in range(out_t.shape[0]):
+        # Skip blank lines (consecutive '\n' or '\r\n'), as csv.reader
+        # does -- the arrays are sized over non-blank lines only
+        while pos < n and (buf[pos] == 10 or buf[pos] == 13):
+            pos += 1
+        for col in range(11):
+            neg = False
+            if pos < n and buf[pos] == 45:    # '-'
+                neg = True
+                pos += 1
+            elif pos < n and buf[pos] == 43:  # '+'
+                pos += 1
+            val = 0.0
+            while pos < n and 48 <= buf[pos] <= 57:
+                val = val * 10.0 + (buf[pos] - 48)
+                pos += 1
+            if pos < n and buf[pos] == 46:    # '.'
+                pos += 1
+                frac = 0.0
+                scale = 1.0
+                while pos < n and 48 <= buf[pos] <= 57:
+                    frac = frac * 10.0 + (buf[pos] - 48)
+                    scale *= 10.0
+                    pos += 1
+                val += frac / scale
+            if pos < n and (buf[pos] == 101 or buf[pos] == 69):  # 'e', 'E'
+                pos += 1
+                eneg = False
+                if pos < n and buf[pos] == 45:
+                    eneg = True
+                    pos += 1
+                elif pos < n and buf[pos] == 43:
+                    pos += 1
+                exp = 0
+                while pos < n and 48 <= buf[pos] <= 57:
+                    exp = exp * 10 + (buf[pos] - 48)
+                    pos += 1
+                val *= 10.0 ** (-exp if eneg else exp)
+            if neg:
+                val = -val
+            if col == 0:
+                out_t[row] = val
+            elif col < 7:
+                out_sig[col - 1, row] = val
+            elif col < 10:
+                out_int[col - 7, row] = int(val)
+            else:
+                out_faults[row] = int(val)
+            # Skip any unconsumed bytes ('\r') plus the delimiter
+            while pos < n and buf[pos] != 44 and buf[pos] != 10:
+                pos += 1
+            if pos < n:
+                pos += 1
+        # Extra trailing fields (column 12+) are ignored, as in the
+        # csv.reader fallback: skip ahead to the next line
+        if pos > 0 and buf[pos - 1] != 10:
+            while pos < n and buf[pos] != 10:
+                pos += 1
+            pos += 1
+
+
+def _parse_csv_numba(raw):
+    """Parse a full CSV blob with the compiled scanner.
+
+    ``raw`` is anything byte-addressable -- a bytes object or an mmap
+    view -- and the body is wrapped zero-copy with np.frombuffer.
+    Returns ({field_name: column_array}, n_rows); (empty, 0) when the
+    blob has no header or no data rows.
+    """
+    header_end = raw.find(b'\n')
+    if header_end < 0:
+        return {}, 0
+    names = bytes(raw[:header_end]).decode('ascii').strip().split(',')
+    body = np.frombuffer(raw, dtype=np.uint8, offset=header_end + 1)
+    if body.size == 0:
+        return {}, 0
+    # Size the arrays over non-blank lines only: trailing newlines and
+    # stray blank lines (plain or '\r\n') hold no row
+    nl = np.flatnonzero(body == 10)
+    starts = np.concatenate(([0], nl + 1))
+    ends = np.concatenate((nl, [body.size]))
+    lengths = ends - starts
+    first = body[np.minimum(starts, body.size - 1)]
+    blank = (lengths == 0) | ((lengths == 1) & (first == 13))
+    n_rows = int(np.count_nonzero(~blank))
+    # Extra trailing columns are tolerated (and ignored), matching the
+    # pandas and csv.reader paths; only the 11 known leading fields are
+    # kept
+    if n_rows == 0 or len(names) < 11:
+        return {}, 0
+    out_t = np.empty(n_rows, dtype=np.float64)
+    out_sig = np.empty((6, n_rows), dtype=np.float32)
+    out_int = np.empty((3, n_rows), dtype=np.int8)
+    out_faults = np.empty(n_rows, dtype=np.int16)
+    _scan_rows(body, out_t, out_sig, out_int, out_faults)
+    cols = {names[0]: out_t}
+    for i, name in enumerate(names[1:7]):
+        cols[name] = out_sig[i]
+    for i, name in enumerate(names[7:10]):
+        cols[name] = out_int[i]
+    cols[names[10]] = out_faults
+    return cols, n_rows
+
+
+def _read_columns(path):
+    """Load the typed columns of ``path`` (stdin when None).
+
+    Returns ({field_name: column_array}, n_rows). Re-plot runs skip the
+    parse entirely: the columns are cached next to the CSV as
+    <name>.csv.npz, keyed on the source's mtime and size, and reloaded
+    when the CSV has not changed. stdin input is never cached.
+    """
+    cache_path = path + '.npz' if path is not None else None
+    if cache_path is not None:
+        try:
+            src = os.stat(path)
+            npz = np.load(cache_path)
+            if (int(npz['src_mtime_ns']) == src.st_mtime_ns
+                    and int(npz['src_size']) == src.st_size):
+                cols = {name: npz[name] for name in CSV_FIELD_NAMES}
+                return cols, len(cols[CSV_FIELD_NAMES[0]])
+        except (OSError, KeyError, ValueError):
+            pass
+
+    # Real files are memory-mapped so the parsers walk the page cache
+    # directly instead of an in-heap copy of the whole file; stdin has
+    # no backing file and is read as before.
+    if HAVE_PANDAS:
+        # Chunked read: the tokenizer only ever holds 200k rows of
+        # DataFrame at a time, so peak memory tracks one chunk plus the
+        # typed columns instead of a whole-file frame for very large
+        # logs.
+        if path is not None:
+            # Same guard as the numba branch: a zero-byte file cannot
+            # be memory-mapped, and it has no data either way
+            if os.stat(path).st_size == 0:
+                return {}, 0
+            reader = pd.read_csv(path, dtype=CSV_PANDAS_DTYPES, engine='c',
+                                 memory_map=True, chunksize=200_000)
+        else:
+            try:
+                reader = pd.read_csv(sys.stdin, dtype=CSV_PANDAS_DTYPES,
+                                     engine='c', chunksize=200_000)
+            except pd.errors.EmptyDataError:
+                return {}, 0
+        parts = {name: [] for name in CSV_FIELD_NAMES}
+        for chunk in reader:
+            for name in CSV_FIELD_NAMES:
+                parts[name].append(chunk[name].to_numpy())
+        cols = {name: p[0] if len(p) == 1 else
+                np.concatenate(p) if p else
+                np.empty(0, dtype=CSV_PANDAS_DTYPES[name])
+                for name, p in parts.items()}
+        n_rows = len(cols[CSV_FIELD_NAMES[0]])
+    elif HAVE_NUMBA:
+        if path is not None:
+            import mmap
+            with open(path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size:
+                    raw = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                else:
+                    raw = b''
+        else:
+            raw = sys.stdin.buffer.read()
+        cols, n_rows = _parse_csv_numba(raw)
+    else:
+        # Last resort without pandas or numba: stream csv.reader one
+        # row at a time straight into typed column arrays that double
+        # when full. Nothing row-shaped (dicts, tuples, row lists) is
+        # ever materialized, so peak memory stays at the size of the
+        # columns.
+        import csv
+        f = open(path, 'r', newline='') if path is not None else sys.stdin
+        reader = csv.reader(f)
+        names = next(reader, None)
+        cap = 1024
+        bufs = [np.empty(cap, dtype=dt)
+                for dt in CSV_FIELD_TYPES.split(',')]
+        n_rows = 0
+        # Extra trailing columns are tolerated (and ignored), as the
+        # old DictReader-based parse did; only the 11 known leading
+        # fields are kept
+        if names is not None and len(names) >= 11:
+            try:
+                for row in reader:
+                    if not row:
+                        continue
+                    if n_rows == cap:
+                        cap *= 2
+                        bufs = [np.resize(c, cap) for c in bufs]
+                    for i in range(7):
+                        bufs[i][n_rows] = float(row[i])
+                    for i in range(7, 11):
+                        bufs[i][n_rows] = int(row[i])
+                    n_rows += 1
+            except (ValueError, IndexError, OverflowError) as exc:
+                print(f"Malformed CSV row {n_rows + 2}: {exc}",
+                      file=sys.stderr)
+                n_rows = 0
+        if f is not sys.stdin:
+            f.close()
+        cols = {} if names is None else \
+            {name: bufs[i][:n_rows] for i, name in enumerate(names[:11])}
+
+    if cache_path is not None and n_rows:
+        try:
+            src = os.stat(path)
+            np.savez_compressed(cache_path,
+                                src_mtime_ns=src.st_mtime_ns,
+                                src_size=src.st_size,
+                                **{name: cols[name]
+                                   for name in CSV_FIELD_NAMES})
+        except OSError:
+            pass  # a read-only log directory just means no cache
+    return cols, n_rows
+
 
 # ── Thresholds from bms_config.h ─────────────────────────────────────
 OV_WARN_V = 4.210
@@ -56,131 +309,256 @@ OT_WARN_C = 60.0
 OT_FAULT_C = 65.0
 HW_OT_C = 70.0
 
+OV_WARN_LABEL = f'OV Warn ({OV_WARN_V}V)'
+OV_FAULT_LABEL = f'OV Fault ({OV_FAULT_V}V)'
+HW_OV_LABEL = f'HW Safety ({HW_OV_V}V)'
+OT_WARN_LABEL = f'OT Warn ({OT_WARN_C}°C)'
+OT_FAULT_LABEL = f'OT Fault ({OT_FAULT_C}°C)'
+HW_OT_LABEL = f'HW Safety ({HW_OT_C}°C)'
+
 # ── Mode names ───────────────────────────────────────────────────────
 MODE_NAMES = {0: 'OFF', 1: 'POWER_SAVE', 2: 'FAULT', 3: 'READY',
               4: 'CONNECTING', 5: 'CONNECTED', 6: 'NOT_READY'}
 
-# ── Dark theme ───────────────────────────────────────────────────────
-plt.style.use('dark_background')
-fig, axes = plt.subplots(5, 1, figsize=(14, 16), sharex=True,
-                          gridspec_kw={'hspace': 0.25})
-
-fig.suptitle('Corvus Orca ESS Firmware Demo — BQ76952 + STM32F446 + FreeRTOS',
-             fontsize=14, fontweight='bold', color='white', y=0.98)
-
-colors = {'main': '#4FC3F7', 'charge': '#66BB6A', 'discharge': '#FF7043',
+COLORS = {'main': '#4FC3F7', 'charge': '#66BB6A', 'discharge': '#FF7043',
           'warn': '#FFD54F', 'fault': '#EF5350', 'hw': '#AB47BC',
           'limit': '#78909C'}
 
-# ── Panel 1: SoC ────────────────────────────────────────────────────
-ax = axes[0]
-ax.plot(t, soc, color=colors['main'], linewidth=1.5, label='SoC')
-ax.set_ylabel('SoC (%)')
-ax.set_title('State of Charge', fontsize=11)
-ax.set_ylim(0, 105)
-ax.legend(loc='upper left', fontsize=8)
-ax.grid(alpha=0.2)
-
-# Annotate phase transitions
-phase_events = []
-for i in range(1, len(mode)):
-    if mode[i] != mode[i-1]:
-        phase_events.append((t[i], MODE_NAMES.get(mode[i], '?'),
-                             MODE_NAMES.get(mode[i-1], '?')))
-
-for te, to_mode, from_mode in phase_events:
-    ax.axvline(te, color='white', alpha=0.3, linestyle='--', linewidth=0.5)
-
-# ── Panel 2: Cell Voltage ────────────────────────────────────────────
-ax = axes[1]
-ax.plot(t, cell_v, color=colors['main'], linewidth=1.5, label='Cell Voltage')
-ax.axhline(OV_WARN_V, color=colors['warn'], linestyle='--', alpha=0.7,
-           label=f'OV Warn ({OV_WARN_V}V)')
-ax.axhline(OV_FAULT_V, color=colors['fault'], linestyle='--', alpha=0.7,
-           label=f'OV Fault ({OV_FAULT_V}V)')
-ax.axhline(HW_OV_V, color=colors['hw'], linestyle=':', alpha=0.5,
-           label=f'HW Safety ({HW_OV_V}V)')
-ax.set_ylabel('Cell Voltage (V)')
-ax.set_title('Series Element Voltage — Table 13', fontsize=11)
-ax.legend(loc='upper left', fontsize=8)
-ax.grid(alpha=0.2)
-
-# ── Panel 3: Temperature ────────────────────────────────────────────
-ax = axes[2]
-ax.plot(t, temp_c, color=colors['main'], linewidth=1.5, label='Temperature')
-ax.axhline(OT_WARN_C, color=colors['warn'], linestyle='--', alpha=0.7,
-           label=f'OT Warn ({OT_WARN_C}°C)')
-ax.axhline(OT_FAULT_C, color=colors['fault'], linestyle='--', alpha=0.7,
-           label=f'OT Fault ({OT_FAULT_C}°C)')
-ax.axhline(HW_OT_C, color=colors['hw'], linestyle=':', alpha=0.5,
-           label=f'HW Safety ({HW_OT_C}°C)')
-ax.set_ylabel('Temperature (°C)')
-ax.set_title('Cell Temperature — Table 13', fontsize=11)
-ax.legend(loc='upper left', fontsize=8)
-ax.grid(alpha=0.2)
-
-# ── Panel 4: Current & Limits ───────────────────────────────────────
-ax = axes[3]
-ax.plot(t, current_a, color=colors['main'], linewidth=1.5, label='Pack Current')
-ax.plot(t, chg_lim_a, color=colors['charge'], linewidth=1, linestyle='--',
-        alpha=0.7, label='Charge Limit')
-ax.plot(t, -dchg_lim_a, color=colors['discharge'], linewidth=1, linestyle='--',
-        alpha=0.7, label='Discharge Limit')
-ax.set_ylabel('Current (A)')
-ax.set_title('Pack Current & Limits — §7.4', fontsize=11)
-ax.legend(loc='upper left', fontsize=8)
-ax.grid(alpha=0.2)
-
-# ── Panel 5: Mode & Contactor ───────────────────────────────────────
-ax = axes[4]
-
-# Map mode enum to y-axis positions
-mode_y = {0: 0, 1: 1, 2: 2, 3: 3, 4: 4, 5: 5, 6: 6}
-mode_labels = ['OFF', 'POWER_SAVE', 'FAULT', 'READY', 'CONNECTING', 'CONNECTED', 'NOT_READY']
-
-mode_mapped = np.array([mode_y.get(m, 0) for m in mode])
-contactor_mapped = contactor.astype(float) * (6.0 / 5.0)  # scale to same y range
-
-ax.step(t, mode_mapped, color=colors['main'], linewidth=2, where='post',
-        label='Pack Mode')
-ax.step(t, contactor_mapped, color=colors['charge'], linewidth=1.5,
-        where='post', alpha=0.6, label='Contactor State')
-
-ax.set_ylabel('Mode')
-ax.set_yticks(range(7))
-ax.set_yticklabels(mode_labels, fontsize=8)
-ax.set_xlabel('Time (s)')
-ax.set_title('Pack Operation Mode — §7.1', fontsize=11)
-ax.legend(loc='upper right', fontsize=8)
-ax.grid(alpha=0.2)
+# ── Decimation ───────────────────────────────────────────────────────
+def decimate_minmax(t, y, n_px=2048):
+    """Min/max-decimate a series down to ~2 samples per horizontal pixel.
+
+    Slices the series into n_px equal buckets and keeps each bucket's
+    min and max sample (real samples, in time order), which preserves
+    the drawn envelope of a line plot while capping the vertex count
+    that Agg has to simplify and stroke. Series already near render
+    resolution pass through untouched. Step traces are left alone by
+    the callers -- they compress differently.
+    """
+    n = len(y)
+    if n <= 2 * n_px:
+        return t, y
+    step = n // n_px
+    m = step * n_px
+    yb = y[:m].reshape(n_px, step)
+    base = np.arange(n_px) * step
+    idx = np.concatenate((yb.argmin(axis=1) + base,
+                          yb.argmax(axis=1) + base,
+                          np.arange(m, n)))
+    idx.sort()
+    return t[idx], y[idx]
+
+def step_points(t, y):
+    """Compress a step series to its transition points.
+
+    ax.step(where='post') draws the same pixels when fed only the
+    samples where the value changes plus both endpoints, so the vertex
+    count drops from O(N) to O(#transitions).
+    """
+    idx = np.flatnonzero(y[1:] != y[:-1]) + 1
+    idx = np.concatenate(([0], idx, [len(y) - 1]))
+    return t[idx], y[idx]
 
 # ── Warning/Fault shading ───────────────────────────────────────────
-for ax_i in axes:
-    # Shade warning regions
-    warn_start = None
-    for i in range(len(warnings)):
-        if warnings[i] and warn_start is None:
-            warn_start = t[i]
-        elif not warnings[i] and warn_start is not None:
-            ax_i.axvspan(warn_start, t[i], color=colors['warn'], alpha=0.05)
-            warn_start = None
-    if warn_start is not None:
-        ax_i.axvspan(warn_start, t[-1], color=colors['warn'], alpha=0.05)
-
-    # Shade fault regions
-    fault_start = None
-    for i in range(len(faults)):
-        if faults[i] and fault_start is None:
-            fault_start = t[i]
-        elif not faults[i] and fault_start is not None:
-            ax_i.axvspan(fault_start, t[i], color=colors['fault'], alpha=0.08)
-            fault_start = None
-    if fault_start is not None:
-        ax_i.axvspan(fault_start, t[-1], color=colors['fault'], alpha=0.08)
-
-# ── Save ─────────────────────────────────────────────────────────────
-out_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
-                        '..', 'firmware_plot.png')
-fig.savefig(out_path, dpi=150, bbox_inches='tight', facecolor=fig.get_facecolor())
-print(f"Saved: {out_path}", file=sys.stderr)
-plt.close()
+def active_spans(t, flags):
+    """(start_ts, end_ts) of the regions where flags is nonzero.
+
+    Vectorized edge scan on the zero-padded flag vector: rising edges
+    open a span, falling edges close it at the first clear sample, and
+    a span still open at EOF closes on the last sample -- the same
+    spans the old per-axis Python state machine produced, computed
+    once for all axes.
+    """
+    b = (flags != 0).astype(np.int8)
+    edges = np.diff(np.concatenate(([0], b, [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.minimum(np.flatnonzero(edges == -1), len(t) - 1)
+    return t[starts], t[ends]
+
+def span_ranges(spans):
+    """(start, width) pairs for broken_barh from (start_ts, end_ts)."""
+    starts, ends = spans
+    return np.column_stack((starts, ends - starts))
+
+
+def render(path=None, fig=None):
+    """Render the 5-panel plot for ``path`` (stdin when None).
+
+    Returns the finished figure, or None when the log has no data rows.
+    A batch driver plotting many logs can pass the previous figure back
+    in: its axes are cleared and redrawn on the same Agg canvas, which
+    skips the per-figure construction cost.
+    """
+    cols, n_rows = _read_columns(path)
+    if n_rows == 0:
+        return None
+
+    t = cols['time_s']
+    soc = cols['soc_pct']
+    cell_mv = cols['cell_mv']
+    temp_dc = cols['temperature_deci_c']
+    current = cols['current_ma']
+    chg_lim = cols['charge_limit_ma']
+    dchg_lim = cols['discharge_limit_ma']
+    mode = cols['mode']
+    contactor = cols['contactor_state']
+    warnings = cols['warnings']
+    faults = cols['faults']
+
+    # Convert units
+    cell_v = cell_mv / 1000.0
+    temp_c = temp_dc / 10.0
+    current_a = current / 1000.0
+    chg_lim_a = chg_lim / 1000.0
+    dchg_lim_a = dchg_lim / 1000.0
+
+    colors = COLORS
+
+    if fig is None:
+        fig, axes = plt.subplots(5, 1, figsize=(14, 16), sharex=True)
+    else:
+        axes = fig.axes
+        for ax in axes:
+            ax.clear()
+
+    # Fixed margins instead of bbox_inches='tight' at save time: the
+    # layout is deterministic for this 5-panel figure, and 'tight'
+    # costs a full extra render pass just to measure it.
+    fig.subplots_adjust(left=0.08, right=0.99, top=0.94, bottom=0.04,
+                        hspace=0.25)
+
+    fig.suptitle('Corvus Orca ESS Firmware Demo — BQ76952 + STM32F446 + FreeRTOS',
+                 fontsize=14, fontweight='bold', color='white', y=0.98)
+
+    # ── Panel 1: SoC ────────────────────────────────────────────────
+    ax = axes[0]
+    ax.plot(*decimate_minmax(t, soc), color=colors['main'], linewidth=1.5, label='SoC')
+    ax.set_ylabel('SoC (%)')
+    ax.set_title('State of Charge', fontsize=11)
+    ax.set_ylim(0, 105)
+    ax.legend(loc='upper left', fontsize=8)
+    ax.grid(alpha=0.2)
+
+    # Annotate phase transitions: vectorized edge scan instead of a
+    # Python loop over every sample, and one LineCollection instead of
+    # an axvline artist per transition
+    changes = np.flatnonzero(mode[1:] != mode[:-1]) + 1
+    if changes.size:
+        y0, y1 = ax.get_ylim()
+        ax.vlines(t[changes], y0, y1, colors='white', alpha=0.3,
+                  linestyles='--', linewidth=0.5)
+        ax.set_ylim(y0, y1)
+
+    # ── Panel 2: Cell Voltage ───────────────────────────────────────
+    ax = axes[1]
+    ax.plot(*decimate_minmax(t, cell_v), color=colors['main'], linewidth=1.5, label='Cell Voltage')
+    ax.axhline(OV_WARN_V, color=colors['warn'], linestyle='--', alpha=0.7,
+               label=OV_WARN_LABEL)
+    ax.axhline(OV_FAULT_V, color=colors['fault'], linestyle='--', alpha=0.7,
+               label=OV_FAULT_LABEL)
+    ax.axhline(HW_OV_V, color=colors['hw'], linestyle=':', alpha=0.5,
+               label=HW_OV_LABEL)
+    ax.set_ylabel('Cell Voltage (V)')
+    ax.set_title('Series Element Voltage — Table 13', fontsize=11)
+    ax.legend(loc='upper left', fontsize=8)
+    ax.grid(alpha=0.2)
+
+    # ── Panel 3: Temperature ────────────────────────────────────────
+    ax = axes[2]
+    ax.plot(*decimate_minmax(t, temp_c), color=colors['main'], linewidth=1.5, label='Temperature')
+    ax.axhline(OT_WARN_C, color=colors['warn'], linestyle='--', alpha=0.7,
+               label=OT_WARN_LABEL)
+    ax.axhline(OT_FAULT_C, color=colors['fault'], linestyle='--', alpha=0.7,
+               label=OT_FAULT_LABEL)
+    ax.axhline(HW_OT_C, color=colors['hw'], linestyle=':', alpha=0.5,
+               label=HW_OT_LABEL)
+    ax.set_ylabel('Temperature (°C)')
+    ax.set_title('Cell Temperature — Table 13', fontsize=11)
+    ax.legend(loc='upper left', fontsize=8)
+    ax.grid(alpha=0.2)
+
+    # ── Panel 4: Current & Limits ───────────────────────────────────
+    ax = axes[3]
+    ax.plot(*decimate_minmax(t, current_a), color=colors['main'], linewidth=1.5, label='Pack Current')
+    ax.plot(*decimate_minmax(t, chg_lim_a), color=colors['charge'], linewidth=1, linestyle='--',
+            alpha=0.7, label='Charge Limit')
+    ax.plot(*decimate_minmax(t, -dchg_lim_a), color=colors['discharge'], linewidth=1, linestyle='--',
+            alpha=0.7, label='Discharge Limit')
+    ax.set_ylabel('Current (A)')
+    ax.set_title('Pack Current & Limits — §7.4', fontsize=11)
+    ax.legend(loc='upper left', fontsize=8)
+    ax.grid(alpha=0.2)
+
+    # ── Panel 5: Mode & Contactor ───────────────────────────────────
+    ax = axes[4]
+
+    # Map mode enum to y-axis positions: a vectorized table gather
+    # instead of a Python comprehension over every sample (the table is
+    # currently the identity, but keeps its role explicit)
+    mode_y = np.arange(7, dtype=np.int8)
+    mode_labels = ['OFF', 'POWER_SAVE', 'FAULT', 'READY', 'CONNECTING', 'CONNECTED', 'NOT_READY']
+
+    mode_mapped = mode_y[np.clip(mode, 0, len(mode_y) - 1)]
+    contactor_mapped = contactor.astype(float) * (6.0 / 5.0)  # scale to same y range
+
+    # snap=False keeps the compressed (purely rectilinear, few-vertex)
+    # paths out of matplotlib's pixel-snapping heuristic, which would
+    # otherwise render them differently from the full-length series
+    ax.step(*step_points(t, mode_mapped), color=colors['main'], linewidth=2, where='post',
+            label='Pack Mode', snap=False)
+    ax.step(*step_points(t, contactor_mapped), color=colors['charge'], linewidth=1.5,
+            where='post', alpha=0.6, label='Contactor State', snap=False)
+
+    ax.set_ylabel('Mode')
+    ax.set_yticks(range(7))
+    ax.set_yticklabels(mode_labels, fontsize=8)
+    ax.set_xlabel('Time (s)')
+    ax.set_title('Pack Operation Mode — §7.1', fontsize=11)
+    ax.legend(loc='upper right', fontsize=8)
+    ax.grid(alpha=0.2)
+
+    warn_ranges = span_ranges(active_spans(t, warnings))
+    fault_ranges = span_ranges(active_spans(t, faults))
+
+    # Freeze every axis at its autoscaled limits before inserting the
+    # shading collections, so their data extents cannot re-trigger an
+    # autoscale pass at draw time. autoscale_view() first: view limits
+    # are computed lazily, and freezing without it would bake in stale
+    # values.
+    for ax_i in axes:
+        ax_i.autoscale_view()
+        ax_i.set_xlim(ax_i.get_xlim())
+        ax_i.set_ylim(ax_i.get_ylim())
+        ax_i.autoscale(enable=False)
+
+    # One PolyCollection per axis per severity instead of a Patch
+    # artist per span; the x-axis transform pins the spans to full axis
+    # height exactly as axvspan did.
+    for ax_i in axes:
+        if len(warn_ranges):
+            ax_i.broken_barh(warn_ranges, (0, 1),
+                             transform=ax_i.get_xaxis_transform(),
+                             facecolors=colors['warn'], alpha=0.05, linewidth=0)
+        if len(fault_ranges):
+            ax_i.broken_barh(fault_ranges, (0, 1),
+                             transform=ax_i.get_xaxis_transform(),
+                             facecolors=colors['fault'], alpha=0.08, linewidth=0)
+
+    return fig
+
+
+if __name__ == '__main__':
+    fig = render(sys.argv[1] if len(sys.argv) > 1 else None)
+    if fig is None:
+        print("No data!", file=sys.stderr)
+        sys.exit(1)
+
+    out_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            '..', 'firmware_plot.png')
+    # compress_level 1: the demo PNG is written once and thrown away on
+    # the next run, so trade a few hundred kB for a much faster zlib
+    # pass
+    fig.savefig(out_path, dpi=150, facecolor=fig.get_facecolor(),
+                pil_kwargs={'compress_level': 1})
+    print(f"Saved: {out_path}", file=sys.stderr)
+    plt.close()